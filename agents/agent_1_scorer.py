@@ -1,4 +1,5 @@
 """Agent 1: Resume Scorer and Analyzer - VERSION 3.0 with structured output."""
+import logging
 from typing import Dict, List, Optional
 from utils.agent_helper import get_agent_llm_client
 from agents.schemas import ResumeAnalysisSchema, ResumeScoreSchema
@@ -6,6 +7,8 @@ import re
 
 print("[MODULE LOAD] agent_1_scorer.py loaded - VERSION 3.0 with structured output")
 
+logger = logging.getLogger(__name__)
+
 
 class ResumeScorerAgent:
     """Agent that scores resumes and suggests improvements."""
@@ -280,7 +283,8 @@ CRITICAL:
                 )
 
             print(f"[DEBUG] Raw LLM response length: {len(response)} chars")
-            print(f"[DEBUG] Response preview: {response[:500]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[DEBUG] Response preview: %s...", response[:500])
 
             result = self._parse_response(response)
             print(f"[DEBUG] Parsed - Score: {result['score']}, Analysis length: {len(result['analysis'])}, Suggestions: {len(result['suggestions'])}")
@@ -313,7 +317,8 @@ CRITICAL:
             if cleaned_response.endswith("```"):
                 cleaned_response = cleaned_response[:-3].strip()
 
-        print(f"[DEBUG] Cleaned response first 500 chars:\n{cleaned_response[:500]}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DEBUG] Cleaned response first 500 chars:\n%s\n", cleaned_response[:500])
 
         try:
             # Parse JSON
@@ -1,9 +1,12 @@
 """Agent 4: Resume Formatting Validator."""
+import logging
 from typing import Dict, List, Optional
 from utils.agent_helper import get_agent_llm_client
 from agents.schemas import ValidationSchema
 import inspect
 
+logger = logging.getLogger(__name__)
+
 
 class ResumeValidatorAgent:
     """Agent that validates resume formatting, appearance, and consistency."""
@@ -170,7 +173,8 @@ CRITICAL:
             if cleaned_response.endswith("```"):
                 cleaned_response = cleaned_response[:-3].strip()
 
-        print(f"[DEBUG AGENT4] Cleaned response first 500 chars:\n{cleaned_response[:500]}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DEBUG AGENT4] Cleaned response first 500 chars:\n%s\n", cleaned_response[:500])
 
         try:
             # Parse JSON
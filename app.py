@@ -1,4 +1,6 @@
 """Streamlit frontend for Resume Customizer with LangGraph orchestration."""
+import logging
+import os
 import streamlit as st
 import traceback
 
@@ -14,6 +16,12 @@ from utils.settings import (
     add_model, remove_model, set_default_provider, get_default_provider, get_default_model
 )
 
+# Route module loggers (tracing, LLM clients) to stderr; LOG_LEVEL=DEBUG shows debug output
+logging.basicConfig(
+    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
 # Configure LangSmith and Langfuse tracing at startup (cached to prevent reinit on every rerun)
 @st.cache_resource
 def _init_tracing():
@@ -208,19 +216,7 @@ with st.sidebar:
                 if interactions:
                     latest = interactions[-1]
                     # Get raw interaction without truncation for full display
-                    formatted = {
-                        "timestamp": latest.get("timestamp", "N/A"),
-                        "provider": latest.get("provider", "N/A").upper(),
-                        "model": latest.get("model", "N/A"),
-                        "temperature": f"{latest.get('temperature', 0.7):.2f}",
-                        "duration": f"{latest.get('duration_ms', 0):.0f}ms" if latest.get('duration_ms') else "N/A",
-                        "system_prompt": latest.get("system_prompt", ""),
-                        "user_prompt": latest.get("user_prompt", ""),
-                        "response": latest.get("response", ""),
-                        "error": latest.get("error"),
-                        "prompt_chars": latest.get("combined_prompt_length", 0),
-                        "response_chars": latest.get("response_length", 0),
-                    }
+                    formatted = format_interaction(latest, max_length=None)
 
                     st.subheader("Latest LLM Call")
                     col1, col2 = st.columns(2)
@@ -321,9 +317,8 @@ with st.sidebar:
         st.session_state.selected_model = model
 
     # Show configuration status
-    import os
-    from dotenv import load_dotenv
-    load_dotenv()
+    from utils.env_cache import load_env_once
+    load_env_once()
 
     # Get the selected provider's API key environment variable
     selected_prov = get_provider(provider)
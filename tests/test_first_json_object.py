@@ -0,0 +1,57 @@
+"""Unit tests for _first_json_object (JSON span scanning in reasoning output)."""
+from utils.llm_client import _first_json_object
+
+
+def span_text(text: str, start: int = 0):
+    """The text of the span found, or None."""
+    span = _first_json_object(text, start)
+    return text[span[0]:span[1]] if span else None
+
+
+def test_plain_object():
+    assert span_text('{"score": 85}') == '{"score": 85}'
+
+
+def test_object_after_reasoning():
+    text = 'Let me think.\n\n{"score": 85, "analysis": "ok"} trailing words'
+    assert span_text(text) == '{"score": 85, "analysis": "ok"}'
+
+
+def test_nested_objects():
+    obj = '{"score": 1, "details": {"a": {"b": [1, {"c": 2}]}}}'
+    assert span_text('prefix ' + obj + ' {"second": 2}') == obj
+
+
+def test_braces_inside_strings():
+    obj = '{"analysis": "uses {braces} and a lone } here", "score": 3}'
+    assert span_text(obj + ' }') == obj
+
+
+def test_escaped_quotes_and_backslashes():
+    obj = r'{"analysis": "say \"hi\" {not a brace}", "path": "C:\\dir\\", "score": 4}'
+    assert span_text(obj) == obj
+
+
+def test_invalid_json_still_balanced():
+    # Not valid JSON (single quotes, bare words), but the braces balance
+    obj = "{'score': 5, note: {x}}"
+    assert span_text('see ' + obj) == obj
+
+
+def test_truncated_object():
+    assert _first_json_object('{"score": 85, "analysis": {"a": 1}') is None
+
+
+def test_truncated_inside_string():
+    assert _first_json_object('{"score": 85, "analysis": "cut off {') is None
+    assert _first_json_object('{"analysis": "ends on an escape \\') is None
+
+
+def test_no_object():
+    assert _first_json_object('no braces here') is None
+    assert _first_json_object('only a closing } brace') is None
+
+
+def test_start_offset():
+    text = '{"a": 1} {"b": 2}'
+    assert span_text(text, 1) == '{"b": 2}'
@@ -0,0 +1,60 @@
+"""Unit tests for PDFExporter page-break placement (lines_per_page is 45)."""
+import pytest
+
+from utils.pdf_exporter import PDFExporter
+
+BREAK = '<div style="page-break-before: always;"></div>'
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    return PDFExporter(output_dir=str(tmp_path))
+
+
+def section(title: str, lines: int) -> str:
+    """A section that estimates to 2 + lines rendered lines."""
+    return f"## {title}\n" + "".join(f"- item {i}\n" for i in range(lines))
+
+
+def test_everything_fits_on_one_page(exporter):
+    assert exporter._page_break_points([5, 5], 0) == set()
+    assert exporter._page_break_points([10, 10, 20], 5) == set()
+
+
+def test_no_sections(exporter):
+    assert exporter._page_break_points([], 3) == set()
+
+
+def test_break_positions(exporter):
+    # [20, 20] fills the first page; [10] alone would leave 35 lines empty
+    assert exporter._page_break_points([20, 20, 10, 40], 0) == {1, 3}
+    assert exporter._page_break_points([20, 26, 20, 40], 0) == {1, 2, 3}
+    assert exporter._page_break_points([28, 28], 0) == {1}
+
+
+def test_preamble_offset(exporter):
+    # A 30-line preamble leaves no room for the 20-line first section
+    assert exporter._page_break_points([20, 20], 30) == {0}
+    # Breaks are reported as section indexes, not counting the preamble
+    assert exporter._page_break_points([20, 30], 5) == {1}
+
+
+def test_oversized_section_flows_on(exporter):
+    # A section longer than a page is never pushed to a fresh page
+    assert exporter._page_break_points([100, 5], 3) == set()
+    assert exporter._page_break_points([40, 30, 100], 0) == {1}
+    assert exporter._page_break_points([10, 100, 5, 44], 0) == {3}
+
+
+def test_insert_page_breaks_before_chosen_sections(exporter):
+    # 1 preamble line + 27 lines leaves no room for Two's 27; Three's 10 fit after it
+    markdown = "# Name\n\n" + section("One", 25) + section("Two", 25) + section("Three", 8)
+    result = exporter._insert_page_breaks(markdown)
+    assert result.count(BREAK) == 1
+    assert result.index(BREAK) < result.index("## Two") < result.index("## Three")
+    assert result.replace(BREAK + "\n\n", "") == markdown
+
+
+def test_insert_page_breaks_without_sections(exporter):
+    markdown = "# Name\n\nJust a summary.\n"
+    assert exporter._insert_page_breaks(markdown) == markdown
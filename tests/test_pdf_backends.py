@@ -0,0 +1,61 @@
+"""Unit tests for the PDF rendering backends (skipped when a backend isn't installed)."""
+import tempfile
+
+import pytest
+
+from utils.pdf_exporter import PDFExporter, _inline_markup, _save_pdf
+
+RESUME = """# Jane Doe
+
+**Software Engineer** | jane@example.com
+
+## Experience
+
+### Engineer | Tech Corp
+*Jan 2020 - Present*
+
+- Built **distributed** systems
+- Cut latency by *40%*
+"""
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    return PDFExporter(output_dir=str(tmp_path))
+
+
+def test_iter_pdf_chunks_streams_whole_pdf(exporter):
+    pytest.importorskip("markdown_pdf")
+    chunks = list(exporter.iter_pdf_chunks(RESUME, chunk_size=1024))
+    data = b"".join(chunks)
+    assert data.startswith(b"%PDF")
+    assert data.rstrip().endswith(b"%%EOF")
+    assert len(chunks) > 1 and all(len(chunk) <= 1024 for chunk in chunks)
+
+
+def test_save_pdf_falls_back_when_file_object_is_unsupported(tmp_path):
+    pytest.importorskip("markdown_pdf")
+    # PyMuPDF can't write into a SpooledTemporaryFile; the temp-file fallback must
+    with tempfile.SpooledTemporaryFile(mode="w+b") as spool:
+        _save_pdf(RESUME, "", spool)
+        spool.seek(0)
+        assert spool.read(4) == b"%PDF"
+
+
+def test_inline_markup_nests_bold_italics():
+    assert _inline_markup("***Lead*** and **bold *mixed* text**") == (
+        "<b><i>Lead</i></b> and <b>bold <i>mixed</i> text</b>"
+    )
+
+
+def test_inline_markup_escapes_link_href():
+    assert _inline_markup('[Portfolio](https://example.com/?q="x"&y=1) <3') == (
+        '<link href="https://example.com/?q=&quot;x&quot;&amp;y=1">Portfolio</link> &lt;3'
+    )
+
+
+def test_fast_backend_renders_bold_italics_and_quoted_links(exporter):
+    pytest.importorskip("reportlab")
+    markdown = RESUME + '\n- ***Promoted*** twice, see [demo](https://example.com/"a")\n'
+    data = exporter.markdown_to_pdf_bytes(markdown, backend="fast")
+    assert data.startswith(b"%PDF")
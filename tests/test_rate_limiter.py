@@ -0,0 +1,50 @@
+"""Unit tests for the client-side LLM rate limiter."""
+import pytest
+
+from utils import llm_client
+from utils.llm_client import _TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock that time.sleep advances."""
+    now = [1000.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(llm_client.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(llm_client.time, "sleep", sleep)
+    return now
+
+
+def sent_within(bucket, clock, seconds, attempts):
+    """How many of attempts back-to-back acquires go out in the first seconds."""
+    start = clock[0]
+    sent = 0
+    for _ in range(attempts):
+        bucket.acquire()
+        if clock[0] - start < seconds:
+            sent += 1
+    return sent
+
+
+def test_fresh_bucket_stays_under_rpm_in_first_minute(clock):
+    bucket = _TokenBucket(requests_per_minute=60)
+    # A bucket that started full would let about 120 through in the first minute
+    assert sent_within(bucket, clock, 60.0, attempts=200) <= 61
+
+
+def test_idle_bucket_does_not_bank_a_burst(clock):
+    bucket = _TokenBucket(requests_per_minute=60)
+    clock[0] += 3600
+    assert sent_within(bucket, clock, 60.0, attempts=200) <= 61
+
+
+def test_requests_are_evenly_spaced(clock):
+    bucket = _TokenBucket(requests_per_minute=120)
+    times = []
+    for _ in range(5):
+        bucket.acquire()
+        times.append(clock[0])
+    assert [b - a for a, b in zip(times, times[1:])] == pytest.approx([0.5] * 4)
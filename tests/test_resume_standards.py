@@ -0,0 +1,49 @@
+"""Unit tests for validate_resume_against_standards' job-metadata checks."""
+from utils.resume_standards import validate_resume_against_standards
+
+GOOD = "**Engineer** | Acme | NYC | *Full-time*\\\n*Built the payments platform*\n"
+
+
+def issues(resume: str, severity: str):
+    return [i for i in validate_resume_against_standards(resume)["issues"] if i["severity"] == severity]
+
+
+def test_well_formed_metadata_passes():
+    # The trailing backslash comes after the closing '*' and still counts
+    result = validate_resume_against_standards(GOOD)
+    assert result["is_valid"]
+    assert result["issues"] == []
+
+
+def test_missing_backslash_is_critical():
+    resume = GOOD.replace("\\\n", "\n")
+    assert len(issues(resume, "CRITICAL")) == 1
+    assert not validate_resume_against_standards(resume)["is_valid"]
+
+
+def test_indented_metadata_is_checked():
+    resume = "  **Engineer** | Acme | NYC | *Full-time*\n  Not a headline\n"
+    assert len(issues(resume, "CRITICAL")) == 1
+    assert len(issues(resume, "WARNING")) == 1
+
+
+def test_mid_line_metadata_gets_backslash_check_only():
+    resume = "Previously: **Engineer** | Acme | NYC | *Full-time*\nNot a headline\n"
+    assert len(issues(resume, "CRITICAL")) == 1
+    assert issues(resume, "WARNING") == []
+
+
+def test_each_metadata_line_reported_separately():
+    resume = (
+        "**Engineer** | Acme | NYC | *Full-time*\n"
+        "**Intern** | Beta | SF | *Part-time*\n"
+    )
+    critical = issues(resume, "CRITICAL")
+    assert len(critical) == 2
+    assert "Acme" in critical[0]["description"] and "Beta" in critical[1]["description"]
+
+
+def test_missing_headline_is_a_warning():
+    resume = GOOD.replace("*Built the payments platform*", "Built the payments platform")
+    assert issues(resume, "CRITICAL") == []
+    assert len(issues(resume, "WARNING")) == 1
@@ -1,8 +1,8 @@
 """Test vLLM server limits by requesting increasing max_tokens."""
+import asyncio
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
-import httpx
+import aiohttp
 
 load_dotenv()
 
@@ -10,63 +10,77 @@ api_key = os.getenv("CUSTOM_LLM_API_KEY")
 base_url = os.getenv("CUSTOM_LLM_BASE_URL")
 model = os.getenv("CUSTOM_LLM_MODEL")
 
-def add_api_key_header(request: httpx.Request):
-    if "Authorization" in request.headers:
-        del request.headers["Authorization"]
-    request.headers["X-API-Key"] = api_key
-
-http_client = httpx.Client(
-    event_hooks={"request": [add_api_key_header]},
-    timeout=120.0
-)
+# Test with different max_tokens values
+test_values = [256, 512, 1024, 2048, 4096]
 
-client = OpenAI(
-    api_key="dummy",
-    base_url=base_url,
-    http_client=http_client
-)
 
-print(f"Testing vLLM server: {base_url}")
-print(f"Model: {model}")
-print("=" * 80)
+async def call(session: aiohttp.ClientSession, max_tokens: int) -> dict:
+    """POST one chat completion directly to the vLLM server (X-API-Key auth)."""
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": "You are a helpful assistant that writes long, detailed responses."},
+            {"role": "user", "content": f"Write a very detailed analysis that is at least {max_tokens * 3} characters long. Keep writing until you reach that length. Include multiple paragraphs and details."}
+        ],
+        "max_tokens": max_tokens,
+        "temperature": 0.7
+    }
+    async with session.post(
+        f"{base_url.rstrip('/')}/chat/completions",
+        json=payload,
+        headers={"X-API-Key": api_key}
+    ) as r:
+        r.raise_for_status()
+        return await r.json()
 
-# Test with different max_tokens values
-test_values = [256, 512, 1024, 2048, 4096]
 
-for max_tokens_request in test_values:
+def report(max_tokens_request: int, result) -> None:
+    """Print the outcome for one max_tokens value."""
     print(f"\n[TEST] Requesting max_tokens={max_tokens_request}")
     print("-" * 80)
 
-    try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that writes long, detailed responses."},
-                {"role": "user", "content": f"Write a very detailed analysis that is at least {max_tokens_request * 3} characters long. Keep writing until you reach that length. Include multiple paragraphs and details."}
-            ],
-            max_tokens=max_tokens_request,
-            temperature=0.7
+    if isinstance(result, Exception):
+        print(f"✗ ERROR: {result}")
+        return
+
+    choice = result["choices"][0]
+    content = choice["message"]["content"] or ""
+    finish_reason = choice.get("finish_reason")
+    usage = result.get("usage")
+
+    print(f"✓ Requested: {max_tokens_request} tokens")
+    print(f"  finish_reason: {finish_reason}")
+    print(f"  Response length: {len(content)} chars (~{len(content)//4} tokens)")
+    if usage:
+        print(f"  Actual tokens used: {usage.get('completion_tokens')}")
+    print(f"  First 100 chars: {content[:100]}")
+
+    # Check if we got less than requested
+    actual_tokens = len(content) // 4
+    if actual_tokens < (max_tokens_request * 0.5):
+        print(f"  ⚠️  WARNING: Got {actual_tokens} tokens but requested {max_tokens_request}")
+        print(f"  ⚠️  Server may have a lower limit configured!")
+
+
+async def main():
+    """Run all max_tokens probes concurrently over one pooled session."""
+    connector = aiohttp.TCPConnector(limit=100, limit_per_host=50, keepalive_timeout=75)
+    timeout = aiohttp.ClientTimeout(total=120.0)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        results = await asyncio.gather(
+            *(call(session, max_tokens) for max_tokens in test_values),
+            return_exceptions=True
         )
 
-        content = response.choices[0].message.content
-        finish_reason = response.choices[0].finish_reason
-        usage = response.usage
-
-        print(f"✓ Requested: {max_tokens_request} tokens")
-        print(f"  finish_reason: {finish_reason}")
-        print(f"  Response length: {len(content)} chars (~{len(content)//4} tokens)")
-        if usage:
-            print(f"  Actual tokens used: {usage.completion_tokens}")
-        print(f"  First 100 chars: {content[:100]}")
-
-        # Check if we got less than requested
-        actual_tokens = len(content) // 4
-        if actual_tokens < (max_tokens_request * 0.5):
-            print(f"  ⚠️  WARNING: Got {actual_tokens} tokens but requested {max_tokens_request}")
-            print(f"  ⚠️  Server may have a lower limit configured!")
-
-    except Exception as e:
-        print(f"✗ ERROR: {e}")
+    for max_tokens_request, result in zip(test_values, results):
+        report(max_tokens_request, result)
+
+
+print(f"Testing vLLM server: {base_url}")
+print(f"Model: {model}")
+print("=" * 80)
+
+asyncio.run(main())
 
 print("\n" + "=" * 80)
 print("CONCLUSION:")
@@ -1,9 +1,14 @@
 """Helper functions for agents to access LLM clients."""
-import streamlit as st
-from utils.llm_client import get_llm_client, LLMClient
-from utils.gemini_client import GeminiClient
 import sys
 
+# Streamlit is only needed when running inside the app; CLI/test entry points skip it
+try:
+    import streamlit as st
+except ImportError:
+    st = None
+
+from utils.llm_client import get_llm_client, LLMClient
+
 
 def get_agent_llm_client() -> LLMClient:
     """
@@ -22,7 +27,7 @@ def get_agent_llm_client() -> LLMClient:
     try:
         # Try to get from Streamlit session state
         # Check multiple ways to access session state
-        if hasattr(st, 'session_state'):
+        if st is not None and hasattr(st, 'session_state'):
             print(f"[DEBUG] st.session_state exists: {st.session_state is not None}")
 
             # Method 1: Direct attribute access
@@ -1,8 +1,11 @@
 """Debug utilities for capturing and displaying LLM interactions."""
 import logging
 import os
+import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, List, Deque
 
 # Configure logging
 logger = logging.getLogger("resume_customizer")
@@ -11,6 +14,25 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 logger.setLevel(logging.INFO)
+# Has its own handler; don't also emit through the root logger
+logger.propagate = False
+
+
+@dataclass(frozen=True, slots=True)
+class Interaction:
+    """A single captured LLM call."""
+
+    timestamp_ns: int
+    provider: str
+    model: str
+    system_prompt: str
+    user_prompt: str
+    response: str
+    temperature: float
+    duration_ms: Optional[float]
+    error: Optional[str]
+    combined_prompt_length: int
+    response_length: int
 
 
 class LLMInteractionCapture:
@@ -18,7 +40,12 @@ class LLMInteractionCapture:
 
     def __init__(self):
         """Initialize the interaction capture."""
-        self.interactions: List[Dict[str, Any]] = []
+        # Bounded so long sessions don't grow memory without limit (oldest entries drop first)
+        max_interactions = int(os.getenv("LLM_CAPTURE_MAX", "1000"))
+        self.interactions: Deque[Interaction] = deque(maxlen=max_interactions)
+        # Full text by default (the debug panel shows it raw); set LLM_CAPTURE_MAX_CHARS to
+        # truncate at capture time so long sessions don't pin multi-MB texts in memory
+        self.max_chars = int(os.getenv("LLM_CAPTURE_MAX_CHARS", "0")) or None
         self.enabled = False
 
     def enable(self):
@@ -58,70 +85,74 @@ class LLMInteractionCapture:
         if not self.enabled:
             return
 
-        interaction = {
-            "timestamp": datetime.now().isoformat(),
-            "provider": provider,
-            "model": model,
-            "system_prompt": system_prompt,
-            "user_prompt": user_prompt,
-            "response": response,
-            "temperature": temperature,
-            "duration_ms": duration_ms,
-            "error": error,
-            "combined_prompt_length": len(system_prompt) + len(user_prompt),
-            "response_length": len(response) if response else 0,
-        }
+        max_chars = self.max_chars
+        interaction = Interaction(
+            timestamp_ns=time.time_ns(),
+            provider=provider,
+            model=model,
+            system_prompt=system_prompt[:max_chars],
+            user_prompt=user_prompt[:max_chars],
+            response=response[:max_chars] if response else response,
+            temperature=temperature,
+            duration_ms=duration_ms,
+            error=error,
+            combined_prompt_length=len(system_prompt) + len(user_prompt),
+            response_length=len(response) if response else 0,
+        )
 
         self.interactions.append(interaction)
 
-        # Log to console
-        logger.debug(f"\n{'='*80}")
-        logger.debug(f"LLM CALL: {provider.upper()} ({model})")
-        logger.debug(f"{'='*80}")
-        logger.debug(f"SYSTEM PROMPT:\n{system_prompt[:200]}...")
-        logger.debug(f"\nUSER PROMPT:\n{user_prompt[:200]}...")
-        logger.debug(f"\nRESPONSE:\n{response[:200] if response else 'ERROR'}...")
         if error:
-            logger.error(f"ERROR: {error}")
-        if duration_ms:
-            logger.debug(f"Duration: {duration_ms:.2f}ms")
-        logger.debug(f"{'='*80}\n")
-
-    def get_last_interaction(self) -> Optional[Dict[str, Any]]:
+            logger.error("ERROR: %s", error)
+
+        # Log to console (slicing/formatting skipped unless DEBUG is on)
+        if logger.isEnabledFor(logging.DEBUG):
+            separator = '=' * 80
+            logger.debug("\n%s", separator)
+            logger.debug("LLM CALL: %s (%s)", provider.upper(), model)
+            logger.debug("%s", separator)
+            logger.debug("SYSTEM PROMPT:\n%s...", system_prompt[:200])
+            logger.debug("\nUSER PROMPT:\n%s...", user_prompt[:200])
+            logger.debug("\nRESPONSE:\n%s...", response[:200] if response else 'ERROR')
+            if duration_ms:
+                logger.debug("Duration: %.2fms", duration_ms)
+            logger.debug("%s\n", separator)
+
+    def get_last_interaction(self) -> Optional[Interaction]:
         """Get the last captured interaction."""
         return self.interactions[-1] if self.interactions else None
 
-    def get_all_interactions(self) -> List[Dict[str, Any]]:
+    def get_all_interactions(self) -> List[Interaction]:
         """Get all captured interactions."""
-        return self.interactions
+        return list(self.interactions)
 
     def clear(self):
         """Clear all captured interactions."""
-        self.interactions = []
+        self.interactions.clear()
 
-    def format_for_display(self, interaction: Dict[str, Any], max_length: int = 500) -> Dict[str, str]:
+    def format_for_display(self, interaction: Interaction, max_length: Optional[int] = 500) -> Dict[str, str]:
         """
         Format an interaction for display in Streamlit.
 
         Args:
-            interaction: The interaction dict to format
-            max_length: Maximum length to show for prompts/responses
+            interaction: The interaction to format
+            max_length: Maximum length to show for prompts/responses (None for full text)
 
         Returns:
             Dict with formatted strings for display
         """
         return {
-            "timestamp": interaction.get("timestamp", "N/A"),
-            "provider": interaction.get("provider", "N/A").upper(),
-            "model": interaction.get("model", "N/A"),
-            "temperature": f"{interaction.get('temperature', 0.7):.2f}",
-            "duration": f"{interaction.get('duration_ms', 0):.0f}ms" if interaction.get('duration_ms') else "N/A",
-            "system_prompt": interaction.get("system_prompt", "")[:max_length],
-            "user_prompt": interaction.get("user_prompt", "")[:max_length],
-            "response": interaction.get("response", "")[:max_length],
-            "error": interaction.get("error"),
-            "prompt_chars": interaction.get("combined_prompt_length", 0),
-            "response_chars": interaction.get("response_length", 0),
+            "timestamp": datetime.fromtimestamp(interaction.timestamp_ns / 1e9).isoformat(),
+            "provider": interaction.provider.upper(),
+            "model": interaction.model,
+            "temperature": f"{interaction.temperature:.2f}",
+            "duration": f"{interaction.duration_ms:.0f}ms" if interaction.duration_ms else "N/A",
+            "system_prompt": interaction.system_prompt[:max_length],
+            "user_prompt": interaction.user_prompt[:max_length],
+            "response": (interaction.response or "")[:max_length],
+            "error": interaction.error,
+            "prompt_chars": interaction.combined_prompt_length,
+            "response_chars": interaction.response_length,
         }
 
 
@@ -162,12 +193,12 @@ def capture_llm_call(
     )
 
 
-def get_last_interaction() -> Optional[Dict[str, Any]]:
+def get_last_interaction() -> Optional[Interaction]:
     """Get the last LLM interaction."""
     return _capture.get_last_interaction()
 
 
-def get_all_interactions() -> List[Dict[str, Any]]:
+def get_all_interactions() -> List[Interaction]:
     """Get all LLM interactions."""
     return _capture.get_all_interactions()
 
@@ -177,7 +208,7 @@ def clear_interactions():
     _capture.clear()
 
 
-def format_interaction(interaction: Dict[str, Any], max_length: int = 500) -> Dict[str, str]:
+def format_interaction(interaction: Interaction, max_length: Optional[int] = 500) -> Dict[str, str]:
     """Format an interaction for display."""
     return _capture.format_for_display(interaction, max_length)
 
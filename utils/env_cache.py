@@ -0,0 +1,32 @@
+"""One-time .env loading shared by all modules."""
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=1)
+def load_env_once() -> bool:
+    """
+    Load variables from the .env file at most once per process.
+
+    Modules call this at import time instead of load_dotenv() so the file is
+    located and parsed only on the first call. The search is skipped entirely
+    when DOTENV_SKIP=1, i.e. the deployment (Cloud Run, Kubernetes) injects
+    the configuration itself.
+
+    Returns:
+        True if a .env file was found and loaded
+    """
+    if os.getenv("DOTENV_SKIP") == "1":
+        return False
+
+    from dotenv import load_dotenv
+    return load_dotenv()
+
+
+# Accepted spellings of an enabled flag (checked without lowercasing)
+_TRUTHY = frozenset({"true", "1", "yes", "True", "TRUE", "Yes", "YES"})
+
+
+def env_flag(name: str) -> bool:
+    """Whether the environment variable name is set to true/1/yes (unset means False)."""
+    return os.getenv(name, "false") in _TRUTHY
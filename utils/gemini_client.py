@@ -1,11 +1,20 @@
 """Gemini API client wrapper."""
+import asyncio
+import logging
 import os
-from typing import Optional
-import google.generativeai as genai
-from dotenv import load_dotenv
+import re
+from typing import List, Optional, Tuple
+from utils.env_cache import load_env_once
 
 # VERSION: 2.0 - Added JSON extraction for reasoning models
-load_dotenv()
+load_env_once()
+
+logger = logging.getLogger(__name__)
+
+# Greedy match from the first '{' to the last '}' (fallback JSON extraction)
+_JSON_BLOCK_RE = re.compile(r'\{[\s\S]*\}')
+# Keys that mark an extracted block as one of our JSON responses
+_REQUIRED_KEYS = ('"score"', '"analysis"', '"suggestions"')
 
 
 class GeminiClient:
@@ -13,6 +22,9 @@ class GeminiClient:
 
     def __init__(self):
         """Initialize the Gemini client with API key."""
+        # Imported here so modules that never build a client skip the SDK import cost
+        import google.generativeai as genai
+
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
@@ -78,14 +90,67 @@ class GeminiClient:
         """
         print(f"[DEBUG GeminiClient] generate_with_system_prompt called")
         combined_prompt = f"{system_prompt}\n\n{user_prompt}"
+        # generate_content already extracts JSON from reasoning output
         content = self.generate_content(combined_prompt, temperature)
         print(f"[DEBUG GeminiClient] generate_content returned {len(content)} chars")
 
-        # Extract JSON from reasoning output if needed (for reasoning models)
-        content = self._extract_response_from_reasoning_output(content)
-
         return content
 
+    async def generate_batch(
+        self,
+        prompts: List[Tuple[str, str]],
+        temperature: float = 0.7,
+        max_concurrency: int = 20
+    ) -> List[str]:
+        """
+        Generate content for several (system_prompt, user_prompt) pairs concurrently.
+
+        Requests are issued with generate_content_async so total wall time is close
+        to the slowest single call rather than the sum of all calls.
+
+        Args:
+            prompts: List of (system_prompt, user_prompt) tuples
+            temperature: Creativity level
+            max_concurrency: Maximum number of requests in flight at once
+
+        Returns:
+            Generated text responses, in the same order as prompts
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        generation_config = {"temperature": temperature}
+
+        async def _one(system_prompt: str, user_prompt: str) -> str:
+            async with semaphore:
+                try:
+                    response = await self.model.generate_content_async(
+                        f"{system_prompt}\n\n{user_prompt}",
+                        generation_config=generation_config
+                    )
+                except Exception as e:
+                    raise Exception(f"Error generating content: {str(e)}")
+            return self._extract_response_from_reasoning_output(response.text)
+
+        return await asyncio.gather(*(_one(s, u) for s, u in prompts))
+
+    def generate_batch_sync(
+        self,
+        prompts: List[Tuple[str, str]],
+        temperature: float = 0.7,
+        max_concurrency: int = 20
+    ) -> List[str]:
+        """
+        Synchronous wrapper around generate_batch for callers without an event loop.
+
+        Args:
+            prompts: List of (system_prompt, user_prompt) tuples
+            temperature: Creativity level
+            max_concurrency: Maximum number of requests in flight at once
+
+        Returns:
+            Generated text responses, in the same order as prompts
+        """
+        return asyncio.run(self.generate_batch(prompts, temperature, max_concurrency))
+
     def _extract_response_from_reasoning_output(self, content: str) -> str:
         """
         Extract actual response from reasoning model output.
@@ -100,10 +165,9 @@ class GeminiClient:
         Returns:
             Cleaned response with thinking removed
         """
-        import re
-
-        print(f"[DEBUG EXTRACTION] Starting extraction, content length: {len(content)} chars")
-        print(f"[DEBUG EXTRACTION] Content starts with: {content[:100]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DEBUG EXTRACTION] Starting extraction, content length: %d chars", len(content))
+            logger.debug("[DEBUG EXTRACTION] Content starts with: %s", content[:100])
 
         # Method 1: Handle explicit thinking tags (DeepSeek R1, etc.)
         if "<think>" in content and "</think>" in content:
@@ -131,12 +195,12 @@ class GeminiClient:
             if json_end != -1 and json_end > json_start:
                 potential_json = content[json_start:json_end + 1]
                 # Verify it looks like valid JSON structure
-                if '"score"' in potential_json or '"analysis"' in potential_json or '"suggestions"' in potential_json:
+                if any(key in potential_json for key in _REQUIRED_KEYS):
                     print(f"[DEBUG] Extracted JSON from mixed content (full match), length: {len(potential_json)} chars")
                     return potential_json
 
         # Fallback: Try regex approach for complex cases
-        json_match = re.search(r'\{[\s\S]*\}', content)
+        json_match = _JSON_BLOCK_RE.search(content)
         if json_match:
             potential_json = json_match.group(0)
             # Verify it looks like valid JSON structure
@@ -1,8 +1,13 @@
 """Job description scraper utility."""
+import re
 import requests
-from bs4 import BeautifulSoup
 from typing import Optional
 
+# Runs of 2+ spaces/tabs separate phrases in scraped text
+_WS_COLLAPSE = re.compile(r'[ \t]{2,}')
+# Whitespace around line breaks, including blank lines
+_BLANK = re.compile(r'\s*\n\s*')
+
 
 class JobScraper:
     """Scrapes job descriptions from URLs."""
@@ -21,6 +26,9 @@ class JobScraper:
         Raises:
             Exception: If fetching or parsing fails
         """
+        # Imported lazily: only needed when a URL is actually fetched
+        from bs4 import BeautifulSoup
+
         try:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
@@ -37,10 +45,9 @@ class JobScraper:
             # Get text
             text = soup.get_text()
 
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
+            # Clean up text: one phrase per line, no blank lines
+            text = _WS_COLLAPSE.sub('\n', text)
+            text = _BLANK.sub('\n', text).strip()
 
             if not text:
                 raise ValueError("No text content found at URL")
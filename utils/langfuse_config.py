@@ -1,45 +1,56 @@
 """Langfuse configuration and initialization."""
+import functools
+import logging
 import os
-from dotenv import load_dotenv
+import traceback
+from utils.env_cache import env_flag, load_env_once
 
-load_dotenv()
+try:
+    from langfuse import get_client
+except ImportError:
+    get_client = None
 
+load_env_once()
 
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
 def configure_langfuse():
     """
     Initialize and configure Langfuse for tracing.
 
     This function reads Langfuse environment variables and configures the SDK.
-    It should be called early in the application startup.
+    It should be called early in the application startup. The result is cached,
+    so the client is created once per process; call configure_langfuse.cache_clear()
+    to force re-initialization.
 
     Environment variables:
     - LANGFUSE_PUBLIC_KEY: Public key for Langfuse
     - LANGFUSE_SECRET_KEY: Secret key for Langfuse
     - LANGFUSE_BASE_URL: Langfuse API URL (optional, defaults to https://cloud.langfuse.com)
     - LANGFUSE_ENABLED: Enable/disable Langfuse tracing (true/false)
+    - LANGFUSE_DEBUG: Set to 1 to dump the (masked) Langfuse configuration
     """
-    try:
-        from langfuse import get_client
-    except ImportError:
-        print("[WARNING] langfuse package not installed. Langfuse tracing disabled.")
+    if get_client is None:
+        logger.warning("langfuse package not installed. Langfuse tracing disabled.")
         return None
 
-    # Load environment variables from .env file (in case they're there)
-    load_dotenv()
-
     # Check if tracing is enabled
-    enabled = os.getenv("LANGFUSE_ENABLED", "false").lower() in ("true", "1", "yes")
-
-    # Debug: Print what we found
-    all_env_vars = os.environ.copy()
-    print(f"[DEBUG] All env vars starting with LANGFUSE: {[(k, '***' if len(v) > 0 else 'empty') for k, v in all_env_vars.items() if k.startswith('LANGFUSE')]}")
-    print(f"[DEBUG] LANGFUSE_ENABLED={os.getenv('LANGFUSE_ENABLED', 'not set')}")
-    print(f"[DEBUG] LANGFUSE_PUBLIC_KEY={'***' if os.getenv('LANGFUSE_PUBLIC_KEY') else 'not set'}")
-    print(f"[DEBUG] LANGFUSE_SECRET_KEY={'***' if os.getenv('LANGFUSE_SECRET_KEY') else 'not set'}")
-    print(f"[DEBUG] LANGFUSE_BASE_URL={os.getenv('LANGFUSE_BASE_URL', 'not set (using default)')}")
+    enabled = env_flag("LANGFUSE_ENABLED")
+
+    # Debug: Log what we found (skipped entirely unless LANGFUSE_DEBUG=1 or DEBUG logging is on)
+    level = logging.INFO if os.getenv("LANGFUSE_DEBUG") == "1" else logging.DEBUG
+    if logger.isEnabledFor(level):
+        logger.log(level, "All env vars starting with LANGFUSE: %s",
+                   [(k, '***' if v else 'empty') for k, v in os.environ.items() if k.startswith('LANGFUSE')])
+        logger.log(level, "LANGFUSE_ENABLED=%s", os.getenv('LANGFUSE_ENABLED', 'not set'))
+        logger.log(level, "LANGFUSE_PUBLIC_KEY=%s", '***' if os.getenv('LANGFUSE_PUBLIC_KEY') else 'not set')
+        logger.log(level, "LANGFUSE_SECRET_KEY=%s", '***' if os.getenv('LANGFUSE_SECRET_KEY') else 'not set')
+        logger.log(level, "LANGFUSE_BASE_URL=%s", os.getenv('LANGFUSE_BASE_URL', 'not set (using default)'))
 
     if not enabled:
-        print("[INFO] Langfuse tracing is disabled (LANGFUSE_ENABLED=false)")
+        logger.info("Langfuse tracing is disabled (LANGFUSE_ENABLED=false)")
         return None
 
     # Get required configuration
@@ -48,34 +59,40 @@ def configure_langfuse():
 
     # Validate configuration
     if not public_key:
-        print("[WARNING] LANGFUSE_PUBLIC_KEY not set. Langfuse tracing disabled.")
+        logger.warning("LANGFUSE_PUBLIC_KEY not set. Langfuse tracing disabled.")
         return None
 
     if not secret_key:
-        print("[WARNING] LANGFUSE_SECRET_KEY not set. Langfuse tracing disabled.")
+        logger.warning("LANGFUSE_SECRET_KEY not set. Langfuse tracing disabled.")
         return None
 
     try:
         # Initialize Langfuse client using get_client()
         # Reads from environment variables: LANGFUSE_PUBLIC_KEY, LANGFUSE_SECRET_KEY, LANGFUSE_BASE_URL
-        print(f"[DEBUG] Initializing Langfuse client with get_client()")
+        logger.debug("Initializing Langfuse client with get_client()")
         client = get_client()
 
         # Client initialized
-        print(f"[INFO] Langfuse client initialized successfully")
+        logger.info("Langfuse client initialized successfully")
 
         return client
     except Exception as e:
-        print(f"[ERROR] Failed to initialize Langfuse: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Failed to initialize Langfuse: %s", e)
+        if os.getenv("LANGFUSE_DEBUG") == "1":
+            traceback.print_exc()
         return None
 
 
+@functools.lru_cache(maxsize=1)
 def is_langfuse_enabled():
-    """Check if Langfuse tracing is enabled."""
-    enabled = os.getenv("LANGFUSE_ENABLED", "false").lower() in ("true", "1", "yes")
-    public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
-    secret_key = os.getenv("LANGFUSE_SECRET_KEY")
+    """
+    Check if Langfuse tracing is enabled.
+
+    Environment variables are read once; call is_langfuse_enabled.cache_clear()
+    to re-read them.
+    """
+    enabled = env_flag("LANGFUSE_ENABLED")
+    public_key = os.environ.get("LANGFUSE_PUBLIC_KEY")
+    secret_key = os.environ.get("LANGFUSE_SECRET_KEY")
 
     return enabled and public_key and secret_key
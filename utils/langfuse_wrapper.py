@@ -1,38 +1,244 @@
 """Unified tracing wrapper for LangSmith and Langfuse."""
+import atexit
+import logging
 import os
-import json
+import queue
+import threading
 import time
+import traceback
 from typing import Optional, Dict, Any
-from datetime import datetime
-from dotenv import load_dotenv
+from utils.debug import capture_llm_call
+from utils.env_cache import load_env_once
 
-load_dotenv()
+load_env_once()
 
-# Global clients
-_langfuse_client = None
-_langsmith_enabled = False
+logger = logging.getLogger(__name__)
+
+# Logged calls are handled by one background worker (Langfuse generation plus
+# debug capture) so neither, nor the HTTP round-trip of flush(), sits on the
+# LLM request path
+_LANGFUSE_FLUSH_BATCH_SIZE = 20
+_LANGFUSE_FLUSH_INTERVAL_S = 5.0
+# Bounded so a stalled tracing backend can't grow memory without limit;
+# calls arriving while it is full are dropped and counted
+_LOG_QUEUE_MAX_SIZE = 10000
+_log_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=_LOG_QUEUE_MAX_SIZE)
+_log_worker: Optional[threading.Thread] = None
+_log_worker_lock = threading.Lock()
+_dropped = 0
+
+# Bits of _TracingSingleton.mask
+_LANGSMITH_BIT = 1
+_LANGFUSE_BIT = 2
+
+
+class _TracingSingleton:
+    """Process-wide tracing clients, created on first access."""
+
+    _instance: Optional["_TracingSingleton"] = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        """Read tracing configuration and build the Langfuse client."""
+        from utils.langsmith_config import is_langsmith_enabled
+        from utils.langfuse_config import configure_langfuse
+
+        self.langsmith_enabled = bool(is_langsmith_enabled())
+        self.langfuse_client = configure_langfuse()
+        # Single int tested on the hot path instead of the two checks above
+        self.mask = (
+            (_LANGSMITH_BIT if self.langsmith_enabled else 0)
+            | (_LANGFUSE_BIT if self.langfuse_client is not None else 0)
+        )
+
+    @classmethod
+    def get(cls) -> "_TracingSingleton":
+        """Return the shared instance, initializing it once (double-checked lock)."""
+        instance = cls._instance
+        if instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls._create()
+                instance = cls._instance
+        return instance
+
+    @classmethod
+    def reinitialize(cls) -> "_TracingSingleton":
+        """Replace the shared instance with a freshly configured one."""
+        with cls._lock:
+            cls._instance = cls._create()
+            return cls._instance
+
+    @classmethod
+    def _create(cls) -> "_TracingSingleton":
+        """Build an instance; caller holds the lock."""
+        instance = cls()
+
+        # With nothing enabled, callers going through the module attribute
+        # (langfuse_wrapper.log_llm_call) hit a no-op instead of the full path
+        globals()["log_llm_call"] = _log_llm_call if instance.mask else _log_llm_call_disabled
+
+        return instance
 
 
 def initialize_tracing():
     """Initialize both LangSmith and Langfuse clients."""
-    global _langfuse_client, _langsmith_enabled
+    _TracingSingleton.reinitialize()
+
+
+def refresh_tracing_env_cache():
+    """
+    Re-read tracing environment variables and re-initialize clients.
 
-    # Check LangSmith
-    from utils.langsmith_config import is_langsmith_enabled
-    _langsmith_enabled = is_langsmith_enabled()
+    The enabled checks and the Langfuse client are cached for the life of the
+    process; tests that change LANGSMITH_* / LANGFUSE_* env vars call this.
+    """
+    from utils.langsmith_config import configure_langsmith
+    from utils.langfuse_config import configure_langfuse, is_langfuse_enabled
+
+    configure_langsmith()
+    is_langfuse_enabled.cache_clear()
+    configure_langfuse.cache_clear()
+    initialize_tracing()
+
+
+def _record_langfuse_generation(start_observation, item: Dict[str, Any]):
+    """
+    Create the Langfuse generation for one queued LLM call (no flush).
+
+    start_observation is the client's bound start_as_current_observation,
+    resolved once by the caller rather than per generation.
+    """
+    combined_prompt = f"System: {item['system_prompt']}\n\nUser: {item['user_prompt']}"
+    try:
+        # Create trace for LLM call using context manager
+        with start_observation(
+            as_type="generation",
+            name=f"LLM Call - {item['provider'].upper()} - {item['model']}",
+            model=item["model"],
+            input=combined_prompt,
+            metadata=item["metadata"],
+        ) as observation:
+            # Update with output (don't include 'output' in context manager params)
+            observation.update(
+                output=item["response"] if not item["error"] else None,
+            )
+    except Exception as e:
+        logger.warning("Failed to log to Langfuse: %s", e)
+        if os.getenv("LANGFUSE_DEBUG") == "1":
+            traceback.print_exc()
 
-    # Initialize Langfuse
-    from utils.langfuse_config import configure_langfuse
-    _langfuse_client = configure_langfuse()
+
+def _flush_langfuse(client):
+    """Flush buffered Langfuse events."""
+    try:
+        client.flush()
+    except Exception as e:
+        logger.warning("Failed to flush Langfuse: %s", e)
+
+
+def _capture_debug(item: Dict[str, Any]):
+    """Record one queued LLM call in the debug capture."""
+    try:
+        capture_llm_call(
+            provider=item["provider"],
+            model=item["model"],
+            system_prompt=item["system_prompt"],
+            user_prompt=item["user_prompt"],
+            response=item["response"],
+            temperature=item["temperature"],
+            duration_ms=item["duration_ms"],
+            error=item["error"],
+        )
+    except Exception as e:
+        logger.warning("Failed to log to debug capture: %s", e)
+
+
+def _langfuse_client():
+    """The Langfuse client if Langfuse tracing is enabled, else None."""
+    tracing = _TracingSingleton.get()
+    return tracing.langfuse_client if tracing.mask & _LANGFUSE_BIT else None
+
+
+def _log_worker_loop():
+    """Handle queued calls, flushing Langfuse once per batch or interval."""
+    pending = 0
+    last_flush = time.monotonic()
+    bound_client = start_observation = None
+    while True:
+        try:
+            item = _log_queue.get(timeout=_LANGFUSE_FLUSH_INTERVAL_S)
+        except queue.Empty:
+            item = None
+
+        client = _langfuse_client()
+        if item is not None:
+            if client is not None:
+                if client is not bound_client:
+                    bound_client, start_observation = client, client.start_as_current_observation
+                _record_langfuse_generation(start_observation, item)
+                pending += 1
+            _capture_debug(item)
+            _log_queue.task_done()
+
+        if pending and (
+            pending >= _LANGFUSE_FLUSH_BATCH_SIZE
+            or time.monotonic() - last_flush >= _LANGFUSE_FLUSH_INTERVAL_S
+        ):
+            if client is not None:
+                _flush_langfuse(client)
+            pending = 0
+            last_flush = time.monotonic()
+
+
+def _ensure_log_worker():
+    """Start the background worker (and its exit flush) on first use."""
+    global _log_worker
+    if _log_worker is not None:
+        return
+    with _log_worker_lock:
+        if _log_worker is None:
+            _log_worker = threading.Thread(
+                target=_log_worker_loop, name="llm-log", daemon=True
+            )
+            _log_worker.start()
+            # Send anything still queued before the interpreter exits
+            atexit.register(flush_tracing)
+
+
+def flush_tracing():
+    """Handle any queued calls and flush Langfuse synchronously."""
+    client = _langfuse_client()
+    start_observation = client.start_as_current_observation if client is not None else None
+    while True:
+        try:
+            item = _log_queue.get_nowait()
+        except queue.Empty:
+            break
+        if start_observation is not None:
+            _record_langfuse_generation(start_observation, item)
+        _capture_debug(item)
+        _log_queue.task_done()
+    if client is not None:
+        _flush_langfuse(client)
+
+
+def dropped_count() -> int:
+    """Number of calls dropped because the log queue was full."""
+    return _dropped
 
 
 def is_tracing_enabled():
     """Check if any tracing platform is enabled."""
-    global _langfuse_client, _langsmith_enabled
-    return _langsmith_enabled or _langfuse_client is not None
+    tracing = _TracingSingleton.get()
+    return bool(tracing.mask)
+
+
+def _log_llm_call_disabled(*args, **kwargs):
+    """Stand-in for log_llm_call while no tracing platform is enabled."""
 
 
-def log_llm_call(
+def _log_llm_call(
     provider: str,
     model: str,
     system_prompt: str,
@@ -57,17 +263,15 @@ def log_llm_call(
         error: Error message if request failed
         metadata: Additional metadata to log
     """
-    global _langfuse_client
-
-    if not (_langsmith_enabled or _langfuse_client):
+    global _dropped
+    tracing = _TracingSingleton.get()
+    if not tracing.mask:
         return
 
-    # Prepare common data
-    combined_prompt = f"System: {system_prompt}\n\nUser: {user_prompt}"
-    timestamp = datetime.utcnow().isoformat()
-
-    metadata = metadata or {}
-    metadata.update({
+    # Built once and handed to the worker as-is; a fresh dict so the caller's
+    # metadata is never mutated while the generation is still queued
+    metadata = {
+        **(metadata or {}),
         "provider": provider,
         "model": model,
         "temperature": temperature,
@@ -75,55 +279,39 @@ def log_llm_call(
         "user_prompt_length": len(user_prompt),
         "response_length": len(response) if response else 0,
         "duration_ms": duration_ms,
-    })
-
-    # Log to Langfuse if enabled
-    if _langfuse_client:
-        try:
-            # Create trace for LLM call using context manager
-            with _langfuse_client.start_as_current_observation(
-                as_type="generation",
-                name=f"LLM Call - {provider.upper()}",
-                model=model,
-                input=combined_prompt,
-                metadata=metadata,
-            ) as observation:
-                # Update with output (don't include 'output' in context manager params)
-                observation.update(
-                    output=response if not error else None,
-                )
-
-            # Flush to ensure traces are sent to Langfuse
-            _langfuse_client.flush()
-
-        except Exception as e:
-            print(f"[WARNING] Failed to log to Langfuse: {e}")
-            import traceback
-            traceback.print_exc()
+    }
 
-    # Log to LangSmith via debug capture
+    # Recorded in Langfuse (if enabled) and the debug capture by the background worker
+    _ensure_log_worker()
     try:
-        from utils.debug import capture_llm_call
-        capture_llm_call(
-            provider=provider,
-            model=model,
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            response=response,
-            temperature=temperature,
-            duration_ms=duration_ms,
-            error=error,
-        )
-    except Exception as e:
-        print(f"[WARNING] Failed to log to debug capture: {e}")
+        _log_queue.put_nowait({
+            "provider": provider,
+            "model": model,
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "response": response,
+            "temperature": temperature,
+            "duration_ms": duration_ms,
+            "error": error,
+            "metadata": metadata,
+        })
+    except queue.Full:
+        _dropped += 1
+        if _dropped == 1:
+            logger.warning("LLM log queue full (%d); dropping calls", _LOG_QUEUE_MAX_SIZE)
+
+
+# Rebound by _TracingSingleton once tracing state is known; call it as
+# langfuse_wrapper.log_llm_call(...) so the rebinding takes effect
+log_llm_call = _log_llm_call
 
 
 def get_tracing_status():
     """Get status of both tracing platforms."""
-    global _langfuse_client, _langsmith_enabled
+    tracing = _TracingSingleton.get()
 
     return {
-        "langsmith_enabled": _langsmith_enabled,
-        "langfuse_enabled": _langfuse_client is not None,
-        "any_enabled": _langsmith_enabled or _langfuse_client is not None,
+        "langsmith_enabled": bool(tracing.mask & _LANGSMITH_BIT),
+        "langfuse_enabled": bool(tracing.mask & _LANGFUSE_BIT),
+        "any_enabled": bool(tracing.mask),
     }
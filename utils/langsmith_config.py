@@ -1,8 +1,20 @@
 """LangSmith configuration and initialization."""
+import logging
 import os
-from dotenv import load_dotenv
+from typing import Optional
+from utils.env_cache import env_flag, load_env_once
 
-load_dotenv()
+try:
+    from langsmith import Client
+except ImportError:
+    Client = None
+
+load_env_once()
+
+logger = logging.getLogger(__name__)
+
+# Result of the last configure_langsmith(); None until it has run
+_LANGSMITH_OK: Optional[bool] = None
 
 
 def configure_langsmith():
@@ -10,7 +22,8 @@ def configure_langsmith():
     Initialize and configure LangSmith for tracing.
 
     This function reads LangSmith environment variables and configures the SDK.
-    It should be called early in the application startup.
+    It should be called early in the application startup. The result is stored
+    for is_langsmith_enabled().
 
     Environment variables:
     - LANGSMITH_API_KEY: API key for LangSmith (from Secret Manager)
@@ -18,23 +31,28 @@ def configure_langsmith():
     - LANGSMITH_ENDPOINT: LangSmith endpoint (usually https://api.smith.langchain.com)
     - LANGSMITH_TRACING: Enable/disable tracing (true/false)
     """
-    try:
-        from langsmith import Client
-    except ImportError:
-        print("[WARNING] langsmith package not installed. Tracing disabled.")
+    global _LANGSMITH_OK
+    _LANGSMITH_OK = _configure_langsmith()
+    return _LANGSMITH_OK
+
+
+def _configure_langsmith() -> bool:
+    """Validate LangSmith settings and create the client; True if tracing is usable."""
+    if Client is None:
+        logger.warning("langsmith package not installed. Tracing disabled.")
         return False
 
     # Check if tracing is enabled
-    tracing_enabled = os.getenv("LANGSMITH_TRACING", "false").lower() in ("true", "1", "yes")
+    tracing_enabled = env_flag("LANGSMITH_TRACING")
 
-    # Debug: Print what we found
-    print(f"[DEBUG] LANGSMITH_TRACING={os.getenv('LANGSMITH_TRACING', 'not set')}")
-    print(f"[DEBUG] LANGSMITH_PROJECT={os.getenv('LANGSMITH_PROJECT', 'not set')}")
-    print(f"[DEBUG] LANGSMITH_ENDPOINT={os.getenv('LANGSMITH_ENDPOINT', 'not set')}")
-    print(f"[DEBUG] LANGSMITH_API_KEY={'***' if os.getenv('LANGSMITH_API_KEY') else 'not set'}")
+    # Debug: Log what we found
+    logger.debug("LANGSMITH_TRACING=%s", os.getenv('LANGSMITH_TRACING', 'not set'))
+    logger.debug("LANGSMITH_PROJECT=%s", os.getenv('LANGSMITH_PROJECT', 'not set'))
+    logger.debug("LANGSMITH_ENDPOINT=%s", os.getenv('LANGSMITH_ENDPOINT', 'not set'))
+    logger.debug("LANGSMITH_API_KEY=%s", '***' if os.getenv('LANGSMITH_API_KEY') else 'not set')
 
     if not tracing_enabled:
-        print("[INFO] LangSmith tracing is disabled (LANGSMITH_TRACING=false)")
+        logger.info("LangSmith tracing is disabled (LANGSMITH_TRACING=false)")
         return False
 
     # Get required configuration
@@ -44,15 +62,15 @@ def configure_langsmith():
 
     # Validate configuration
     if not api_key:
-        print("[WARNING] LANGSMITH_API_KEY not set. LangSmith tracing disabled.")
+        logger.warning("LANGSMITH_API_KEY not set. LangSmith tracing disabled.")
         return False
 
     if not endpoint:
-        print("[WARNING] LANGSMITH_ENDPOINT not set. LangSmith tracing disabled.")
+        logger.warning("LANGSMITH_ENDPOINT not set. LangSmith tracing disabled.")
         return False
 
     if not project:
-        print("[WARNING] LANGSMITH_PROJECT not set. LangSmith tracing disabled.")
+        logger.warning("LANGSMITH_PROJECT not set. LangSmith tracing disabled.")
         return False
 
     try:
@@ -61,24 +79,26 @@ def configure_langsmith():
         client = Client()
 
         # Verify connection by checking project
-        print(f"[INFO] LangSmith tracing enabled")
-        print(f"[INFO] Project: {project}")
-        print(f"[INFO] Endpoint: {endpoint}")
-        print(f"[INFO] Client initialized successfully")
+        logger.info("LangSmith tracing enabled")
+        logger.info("Project: %s", project)
+        logger.info("Endpoint: %s", endpoint)
+        logger.info("Client initialized successfully")
 
         return True
     except Exception as e:
-        print(f"[ERROR] Failed to initialize LangSmith: {e}")
+        logger.error("Failed to initialize LangSmith: %s", e)
         import traceback
         traceback.print_exc()
         return False
 
 
 def is_langsmith_enabled():
-    """Check if LangSmith tracing is enabled."""
-    tracing_enabled = os.getenv("LANGSMITH_TRACING", "false").lower() in ("true", "1", "yes")
-    api_key = os.getenv("LANGSMITH_API_KEY")
-    endpoint = os.getenv("LANGSMITH_ENDPOINT")
-    project = os.getenv("LANGSMITH_PROJECT")
+    """
+    Check if LangSmith tracing is enabled.
 
-    return tracing_enabled and api_key and endpoint and project
+    Returns the validated result of configure_langsmith(), running it on first
+    use; call configure_langsmith() again to re-read the environment.
+    """
+    if _LANGSMITH_OK is None:
+        configure_langsmith()
+    return _LANGSMITH_OK
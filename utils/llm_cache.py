@@ -0,0 +1,175 @@
+"""Two-tier cache of deterministic LLM responses.
+
+An in-process LRU (256 entries) always sits in front; the SQLite file behind
+it, shared across sessions, is enabled with LLM_CACHE_ENABLED=true. By default
+only temperature-0 calls are cached, since those are the ones where replaying
+a stored response is lossless; callers can force it either way (use_cache).
+
+Environment variables:
+- LLM_CACHE_ENABLED: Enable/disable the SQLite tier (true/false, default false)
+- LLM_CACHE_PATH: SQLite file (default: resume_customizer_llm_cache.sqlite3 in the temp dir)
+- LLM_CACHE_TTL_S: Seconds an entry stays valid (default: 604800, one week)
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from utils.env_cache import env_flag
+
+logger = logging.getLogger(__name__)
+
+# Temperatures below this are treated as deterministic
+_MAX_CACHEABLE_TEMPERATURE = 1e-6
+
+# Entries kept in the in-process tier
+_MEMORY_MAX_ENTRIES = 256
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+# key -> (response, expires_at), least recently used first
+_memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+
+def _connection() -> sqlite3.Connection:
+    """Open the cache database on first use (caller holds _lock)."""
+    global _conn
+    if _conn is None:
+        path = os.getenv(
+            "LLM_CACHE_PATH",
+            os.path.join(tempfile.gettempdir(), "resume_customizer_llm_cache.sqlite3")
+        )
+        _conn = sqlite3.connect(path, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+    return _conn
+
+
+def _disk_enabled() -> bool:
+    """Whether the SQLite tier is switched on."""
+    return env_flag("LLM_CACHE_ENABLED")
+
+
+def _ttl() -> float:
+    """Seconds a new entry stays valid."""
+    return float(os.getenv("LLM_CACHE_TTL_S", "604800"))
+
+
+def _remember(key: str, response: str, expires_at: float):
+    """Store in the in-process tier, evicting the least recently used (caller holds _lock)."""
+    _memory[key] = (response, expires_at)
+    _memory.move_to_end(key)
+    if len(_memory) > _MEMORY_MAX_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def is_cacheable(temperature: float, use_cache: Optional[bool] = None) -> bool:
+    """
+    Whether a call may be served from / stored in the cache.
+
+    Args:
+        temperature: Temperature of the call
+        use_cache: Force caching on or off; None caches temperature-0 calls only
+    """
+    if use_cache is not None:
+        return use_cache
+    return temperature < _MAX_CACHEABLE_TEMPERATURE
+
+
+def make_key(
+    provider: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    **params: Any
+) -> str:
+    """
+    Hash everything that determines the response into a cache key.
+
+    Args:
+        provider: LLM provider (gemini, claude, custom)
+        model: Model name
+        system_prompt: Full system prompt
+        user_prompt: Full user prompt
+        temperature: Temperature parameter used
+        **params: Other request options that change the output (max_tokens, ...)
+
+    Returns:
+        32-character hex digest
+    """
+    material = json.dumps(
+        [provider, model, system_prompt, user_prompt, f"{temperature:.4f}", params],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """Return the cached response for key, or None if missing or expired."""
+    now = time.time()
+    with _lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            if entry[1] >= now:
+                _memory.move_to_end(key)
+                logger.debug("LLM cache hit (memory): %s", key)
+                return entry[0]
+            del _memory[key]
+
+    if not _disk_enabled():
+        return None
+    try:
+        with _lock:
+            row = _connection().execute(
+                "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] >= now:
+                _remember(key, row[0], row[1])
+    except sqlite3.Error as e:
+        logger.warning("LLM cache read failed: %s", e)
+        return None
+
+    if row is None or row[1] < now:
+        return None
+    logger.debug("LLM cache hit: %s", key)
+    return row[0]
+
+
+def put(key: str, response: str):
+    """Store a response under key for LLM_CACHE_TTL_S seconds."""
+    expires_at = time.time() + _ttl()
+    with _lock:
+        _remember(key, response, expires_at)
+
+    if not _disk_enabled():
+        return
+    try:
+        with _lock:
+            conn = _connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, response, expires_at),
+            )
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.warning("LLM cache write failed: %s", e)
+
+
+def clear():
+    """Remove every cached response."""
+    with _lock:
+        _memory.clear()
+        if _disk_enabled():
+            conn = _connection()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
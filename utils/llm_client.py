@@ -1,8 +1,23 @@
 """Abstract LLM client interface with multiple provider implementations."""
+import asyncio
+import collections
+import concurrent.futures
+import datetime
+import functools
+import hashlib
+import itertools
+import json
+import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, Type
 import os
-from dotenv import load_dotenv
+import random
+import re
+import threading
+import time
+import types
+from utils import llm_cache
+from utils.env_cache import env_flag, load_env_once
 
 # Import LangSmith for tracing (optional - only if available)
 try:
@@ -17,22 +32,302 @@ except ImportError:
             return lambda f: f
         return func
 
-load_dotenv()
+load_env_once()
+
+logger = logging.getLogger(__name__)
 
 # Initialize unified tracing (LangSmith + Langfuse)
-# Note: This is imported but not initialized here - initialization happens in app.py with caching
+# Note: This is imported but not initialized here - tracing state is set up lazily on first use.
+# Calls are queued and logged by langfuse_wrapper's background worker; called
+# through the module so its no-op rebinding (tracing disabled) takes effect
 try:
-    from utils.langfuse_wrapper import initialize_tracing, log_llm_call
+    from utils import langfuse_wrapper as _tracing
 except Exception as e:
     print(f"[WARNING] Failed to import tracing: {e}")
-    # Define stub functions if import fails
-    def log_llm_call(*args, **kwargs):
+    # Define a stub if import fails
+    _tracing = types.SimpleNamespace(log_llm_call=lambda **kwargs: None)
+
+
+# Gemini context caches kept per client (one per distinct system prompt)
+_GEMINI_CONTEXT_CACHE_MAX = 32
+
+
+def _prompt_digest(prompt: str) -> bytes:
+    """Key for a prompt in a cache table (a blake2b digest; hash() collisions would mix up entries)."""
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+
+# Phrases that often precede the JSON payload in reasoning-model output
+_JSON_MARKER_RE = re.compile(
+    r'json\n\{|JSON:\n\{|```json|Here(?:\'s| is) the JSON|The JSON response|Final response:|["\']score["\']:',
+    re.IGNORECASE
+)
+# Leading whitespace, matched in place instead of taking content.strip()
+_LEADING_WS_RE = re.compile(r'\s*')
+# Phrases typical of reasoning output that never got to the JSON
+_REASONING_ONLY_RE = re.compile(
+    r'i need to analyze|let me go through|step by step|first,|the score is|the user has provided',
+    re.IGNORECASE
+)
+# Any key that marks an extracted block as one of our JSON responses
+_REQUIRED_KEY_RE = re.compile(r'"(?:score|analysis|suggestions)"')
+# For _first_json_object: a decoder for the valid-JSON fast path, and a JSON
+# string literal (group 1 is its closing quote, None if unterminated) or brace
+_JSON_DECODER = json.JSONDecoder()
+_JSON_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\[\s\S][^"\\]*)*(")?|[{}]')
+
+
+def _api_keys(env_var: str) -> List[str]:
+    """
+    API keys from env_var + "S" (comma-separated, for round-robin), else env_var.
+
+    e.g. ANTHROPIC_API_KEYS=k1,k2,k3 or ANTHROPIC_API_KEY=k1
+    """
+    keys = [k.strip() for k in os.getenv(env_var + "S", "").split(",") if k.strip()]
+    if not keys and os.getenv(env_var):
+        keys = [os.getenv(env_var)]
+    return keys
+
+
+def _print_banner(*lines: str):
+    """Print a boxed stdout banner, only when LLM_DEBUG_BANNER=1 (logging covers the rest)."""
+    if os.getenv("LLM_DEBUG_BANNER") != "1":
+        return
+    print(f"\n{'='*60}")
+    for line in lines:
+        print(line)
+    print(f"{'='*60}\n")
+
+
+def _first_json_object(text: str, start: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Find the first complete top-level {...} at or after start.
+
+    Valid JSON is spanned by json's C decoder. Otherwise _JSON_TOKEN_RE jumps
+    from brace to brace, consuming whole string literals (with backslash
+    escapes) in one step, so braces inside JSON strings don't count and the
+    per-character work stays in the regex engine.
+
+    Returns:
+        (begin, end) slice bounds of the object, or None if none closes
+    """
+    first = text.find('{', start)
+    if first == -1:
+        return None
+    # Usually the object is valid JSON, which the C decoder spans fastest
+    try:
+        return first, _JSON_DECODER.raw_decode(text, first)[1]
+    except ValueError:
         pass
+    depth = 0
+    begin = first
+    for match in _JSON_TOKEN_RE.finditer(text, first):
+        ch = text[match.start()]
+        if ch == '"':
+            if match.group(1) is None:
+                return None  # string runs off the end of the text
+        elif ch == '{':
+            if depth == 0:
+                begin = match.start()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                return begin, match.end()
+    return None
+
+
+@functools.lru_cache(maxsize=8)
+def _encoder_for(model: str):
+    """Return a tiktoken encoder for model, or None if tiktoken isn't installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Not an OpenAI model name (vLLM/Ollama models); cl100k is a close proxy
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_tokens(text: str, model: str) -> int:
+    """Count tokens with tiktoken, falling back to the 4-chars-per-token estimate."""
+    encoder = _encoder_for(model)
+    if encoder is None:
+        return len(text) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+class _StreamAccumulator:
+    """
+    Collects streamed response text, tracking <think> blocks as chunks arrive.
+
+    Only the new chunk (plus a few carried-over characters, for tags split
+    across chunks) is scanned, so when the stream ends the text after the last
+    </think> is known without re-scanning the whole response.
+    """
+
+    __slots__ = ("_parts", "_length", "_tail", "_think_seen", "_close_end")
+
+    _OPEN = "<think>"
+    _CLOSE = "</think>"
+
+    def __init__(self):
+        """Start with an empty buffer."""
+        self._parts = []
+        self._length = 0
+        self._tail = ""
+        self._think_seen = False
+        self._close_end = -1
+
+    def feed(self, text: Optional[str]):
+        """Append one streamed chunk."""
+        if not text:
+            return
+        window = self._tail + text
+        offset = self._length - len(self._tail)
+        if not self._think_seen and self._OPEN in window:
+            self._think_seen = True
+        pos = window.rfind(self._CLOSE)
+        if pos != -1:
+            self._close_end = offset + pos + len(self._CLOSE)
+        self._parts.append(text)
+        self._length += len(text)
+        self._tail = window[-(len(self._CLOSE) - 1):]
+
+    @property
+    def text(self) -> str:
+        """The full response received so far."""
+        return "".join(self._parts)
+
+    def post_think(self) -> Optional[str]:
+        """Stripped text after the last </think>, or None without a think block."""
+        if self._think_seen and self._close_end != -1:
+            return self.text[self._close_end:].strip()
+        return None
+
+
+class _TokenBucket:
+    """
+    Token-bucket rate limiter shared by sync and async callers.
+
+    Holds a single token and refills continuously, so requests are spaced
+    evenly and no window of T seconds sees more than 1 + T * rate of them
+    (a bucket holding a minute's worth would allow a full burst on top of
+    the steady rate). A caller that finds the bucket empty reserves the
+    next token (the count goes negative) and sleeps until it is due, so
+    waiters are served in order.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = 1.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token; return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait (without blocking the event loop) until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# (provider, model_name) -> limiter, or None when that provider is unthrottled
+_LIMITERS: Dict[Tuple[str, str], Optional[_TokenBucket]] = {}
+_limiters_lock = threading.Lock()
+
+
+def _rate_limiter(provider: str, model_name: str) -> Optional[_TokenBucket]:
+    """
+    Return the limiter for a provider/model.
+
+    Limits come from GEMINI_RPM, CLAUDE_RPM or CUSTOM_RPM (requests per
+    minute, per model); unset or 0 means no client-side limit.
+    """
+    key = (provider, model_name)
+    limiter = _LIMITERS.get(key, False)
+    if limiter is not False:
+        return limiter
+    with _limiters_lock:
+        if key not in _LIMITERS:
+            rpm = float(os.getenv(f"{provider.upper()}_RPM", "0") or 0)
+            _LIMITERS[key] = _TokenBucket(rpm) if rpm > 0 else None
+        return _LIMITERS[key]
+
+
+def _retry_backoff(attempt: int) -> float:
+    """Jittered exponential backoff: about 1s, 2s, 4s, ... capped at 30s."""
+    return min(30.0, (1 << attempt) * random.uniform(0.5, 1.5))
+
+
+def _retryable(method):
+    """
+    Retry a generate method on the client's transient errors.
+
+    The exception types come from self._transient_errors (rate limits, dropped
+    connections, timeouts), set by each client from its SDK. LLM_MAX_RETRIES
+    sets the number of attempts (default 5). When the last attempt fails,
+    self._retries_exhausted(error) runs before the error propagates.
+    """
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            attempts = max(1, int(os.getenv("LLM_MAX_RETRIES", "5")))
+            for attempt in range(attempts):
+                try:
+                    return await method(self, *args, **kwargs)
+                except self._transient_errors as e:
+                    if attempt == attempts - 1:
+                        self._retries_exhausted(e)
+                        raise
+                    delay = _retry_backoff(attempt)
+                    logger.warning("%s failed (%s: %s), attempt %d/%d; retrying in %.1fs",
+                                   type(self).__name__, type(e).__name__, e, attempt + 1, attempts, delay)
+                    await asyncio.sleep(delay)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        attempts = max(1, int(os.getenv("LLM_MAX_RETRIES", "5")))
+        for attempt in range(attempts):
+            try:
+                return method(self, *args, **kwargs)
+            except self._transient_errors as e:
+                if attempt == attempts - 1:
+                    self._retries_exhausted(e)
+                    raise
+                delay = _retry_backoff(attempt)
+                logger.warning("%s failed (%s: %s), attempt %d/%d; retrying in %.1fs",
+                               type(self).__name__, type(e).__name__, e, attempt + 1, attempts, delay)
+                time.sleep(delay)
+    return wrapper
 
 
 class LLMClient(ABC):
     """Abstract base class for LLM clients."""
 
+    # Exceptions worth retrying (see _retryable); each client fills this from its SDK
+    _transient_errors: Tuple[type, ...] = ()
+
+    def _retries_exhausted(self, e: Exception):
+        """Called by _retryable when a transient error outlasted every attempt."""
+
     @abstractmethod
     def generate_with_system_prompt(
         self,
@@ -53,6 +348,125 @@ class LLMClient(ABC):
         """
         pass
 
+    async def agenerate_with_system_prompt(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> str:
+        """
+        Async variant of generate_with_system_prompt.
+
+        The default runs the blocking call in a worker thread; providers
+        override it with their SDK's native async API.
+        """
+        return await asyncio.to_thread(
+            self.generate_with_system_prompt, system_prompt, user_prompt, temperature, **kwargs
+        )
+
+    def generate_batch(
+        self,
+        system_prompt: str,
+        user_prompts: List[str],
+        temperature: float = 0.7,
+        max_workers: int = 10
+    ) -> List[str]:
+        """
+        Generate responses for several user prompts sharing one system prompt.
+
+        The calls run concurrently on a thread pool, so wall time is close to
+        the slowest call rather than the sum. (For large offline jobs billed
+        at batch rates, see get_batch_llm_client().)
+
+        Args:
+            system_prompt: System instruction shared by every call
+            user_prompts: User prompts, one call each
+            temperature: Sampling temperature
+            max_workers: Maximum calls in flight at once
+
+        Returns:
+            Responses in the same order as user_prompts
+
+        Raises:
+            The first error raised by any call
+        """
+        if not user_prompts:
+            return []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(user_prompts))) as pool:
+            return list(pool.map(
+                lambda user_prompt: self.generate_with_system_prompt(system_prompt, user_prompt, temperature),
+                user_prompts
+            ))
+
+    def _cache_lookup(
+        self,
+        provider: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        use_cache: Optional[bool],
+        **params
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look a call up in the response cache (utils.llm_cache).
+
+        Args:
+            use_cache: Force caching on or off; None caches temperature-0 calls only
+
+        Returns:
+            (cache_key, cached_response); cache_key is None when the call is not
+            cacheable, cached_response is None on a miss
+        """
+        if not llm_cache.is_cacheable(temperature, use_cache):
+            return None, None
+        cache_key = llm_cache.make_key(
+            provider, self.model_name, system_prompt, user_prompt, temperature, **params
+        )
+        return cache_key, llm_cache.get(cache_key)
+
+    def _throttle(self, provider: str):
+        """Wait for this provider/model's rate limiter, if {PROVIDER}_RPM is set."""
+        limiter = _rate_limiter(provider, self.model_name)
+        if limiter is not None:
+            limiter.acquire()
+
+    async def _athrottle(self, provider: str):
+        """Async variant of _throttle (sleeps without blocking the event loop)."""
+        limiter = _rate_limiter(provider, self.model_name)
+        if limiter is not None:
+            await limiter.acquire_async()
+
+    def _log_call(
+        self,
+        provider: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        start_time: float,
+        response: str = "",
+        error: Optional[str] = None
+    ):
+        """Queue a finished call (or its error) for LangSmith and Langfuse logging."""
+        _tracing.log_llm_call(
+            provider=provider,
+            model=self.model_name,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            response=response,
+            temperature=temperature,
+            duration_ms=(time.monotonic() - start_time) * 1000,
+            error=error,
+        )
+
+    def _extract_from_stream(self, acc: _StreamAccumulator) -> str:
+        """Extract the response from a finished stream, reusing its <think> tracking."""
+        extracted = acc.post_think()
+        if extracted is not None:
+            logger.debug("[DEBUG] Stripped <think> tags while streaming, response length: %d chars", len(extracted))
+            return extracted
+        return self._extract_response_from_reasoning_output(acc.text)
+
     def _extract_response_from_reasoning_output(self, content: str) -> str:
         """
         Extract actual response from reasoning model output.
@@ -67,76 +481,63 @@ class LLMClient(ABC):
         Returns:
             Cleaned response with thinking removed
         """
-        import re
-
-        print(f"[DEBUG EXTRACTION] Starting extraction, content length: {len(content)} chars")
-        print(f"[DEBUG EXTRACTION] Content starts with: {content[:100]}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("[DEBUG EXTRACTION] Starting extraction, content length: %d chars", len(content))
+            logger.debug("[DEBUG EXTRACTION] Content starts with: %s", content[:100])
+
+        # Cheapest check first: already clean JSON (leading whitespace skipped
+        # by offset, so the content is never copied)
+        ws_end = _LEADING_WS_RE.match(content).end()
+        if content.startswith(('{', '['), ws_end):
+            return content
 
         # Method 1: Handle explicit thinking tags (DeepSeek R1, etc.)
-        if "<think>" in content and "</think>" in content:
+        if "<think>" in content:
             # Extract everything after the last closing </think> tag
-            parts = content.split("</think>")
-            if len(parts) > 1:
-                extracted = parts[-1].strip()
-                print(f"[DEBUG] Stripped <think> tags, response length: {len(extracted)} chars")
+            _, sep, tail = content.rpartition("</think>")
+            if sep:
+                extracted = tail.strip()
+                logger.debug("[DEBUG] Stripped <think> tags, response length: %d chars", len(extracted))
                 return extracted
 
         # Method 2: Try to extract JSON from mixed content
-        # If response starts with non-JSON text but contains JSON, extract it
-        content_stripped = content.strip()
-
-        # Check if response starts with JSON
-        if content_stripped.startswith('{') or content_stripped.startswith('['):
-            return content  # Already clean JSON
-
-        # Try to find JSON object in the response - use greedy match to get complete JSON
-        # Look for the first { and try to match to the last }
-        json_start = content.find('{')
-        print(f"[DEBUG EXTRACTION] json_start position: {json_start}")
-
-        # Also check for common markers that might indicate where JSON starts
-        json_markers = [
-            'json\n{', 'JSON:\n{', '```json',
-            'Here is the JSON', 'Here\'s the JSON',
-            'The JSON response', 'Final response:',
-            '"score":', "'score':"
-        ]
-        for marker in json_markers:
-            marker_pos = content.lower().find(marker.lower())
-            if marker_pos != -1:
-                print(f"[DEBUG EXTRACTION] Found marker '{marker}' at position {marker_pos}")
-                # Look for { after this marker
-                temp_start = content.find('{', marker_pos)
-                if temp_start != -1 and (json_start == -1 or temp_start < json_start):
-                    json_start = temp_start
-                    print(f"[DEBUG EXTRACTION] Updated json_start to {json_start}")
+        # The first '{' is where JSON can start; any marker phrase ("```json",
+        # "Here is the JSON", ...) only ever points at that brace or a later one
+        json_start = content.find('{', ws_end)
+        logger.debug("[DEBUG EXTRACTION] json_start position: %d", json_start)
+        if debug:
+            marker = _JSON_MARKER_RE.search(content)
+            if marker:
+                logger.debug("[DEBUG EXTRACTION] Found marker '%s' at position %d", marker.group(0), marker.start())
+
+        # First balanced {...} that carries one of our keys; a stray '{...}'
+        # in the reasoning before it, or text after it, is skipped
+        span = _first_json_object(content, json_start) if json_start != -1 else None
+        while span is not None:
+            if _REQUIRED_KEY_RE.search(content, span[0], span[1]):
+                potential_json = content[span[0]:span[1]]
+                logger.debug("[DEBUG] Extracted JSON from mixed content (brace scan), length: %d chars", len(potential_json))
+                return potential_json
+            span = _first_json_object(content, span[1])
 
+        # Fallback for unbalanced (e.g. truncated) output: first '{' to last '}'
         if json_start != -1:
-            # Find the matching closing brace
             json_end = content.rfind('}')
-            print(f"[DEBUG EXTRACTION] json_end position: {json_end}")
-            if json_end != -1 and json_end > json_start:
-                potential_json = content[json_start:json_end + 1]
-                print(f"[DEBUG EXTRACTION] Potential JSON length: {len(potential_json)} chars")
-                print("[DEBUG EXTRACTION] Contains 'score':", '"score"' in potential_json)
-                print("[DEBUG EXTRACTION] Contains 'analysis':", '"analysis"' in potential_json)
-                print("[DEBUG EXTRACTION] Contains 'suggestions':", '"suggestions"' in potential_json)
-                # Verify it looks like valid JSON structure
-                if '"score"' in potential_json or '"analysis"' in potential_json or '"suggestions"' in potential_json:
-                    print(f"[DEBUG] Extracted JSON from mixed content (full match), length: {len(potential_json)} chars")
+            logger.debug("[DEBUG EXTRACTION] json_end position: %d", json_end)
+            if json_end > json_start:
+                # Verify it looks like valid JSON structure: one scan of the span
+                # for any of the keys, without slicing it out first
+                has_keys = _REQUIRED_KEY_RE.search(content, json_start, json_end + 1) is not None
+                logger.debug("[DEBUG EXTRACTION] Potential JSON length: %d chars, has keys: %s",
+                             json_end + 1 - json_start, has_keys)
+                if has_keys:
+                    potential_json = content[json_start:json_end + 1]
+                    logger.debug("[DEBUG] Extracted JSON from mixed content (full match), length: %d chars", len(potential_json))
                     return potential_json
-                else:
-                    print(f"[DEBUG EXTRACTION] Potential JSON failed validation check")
-                    print(f"[DEBUG EXTRACTION] First 500 chars: {potential_json[:500]}")
-
-        # Fallback: Try regex approach for complex cases
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
-            potential_json = json_match.group(0)
-            # Verify it looks like valid JSON structure
-            if '"score"' in potential_json or '"analysis"' in potential_json:
-                print(f"[DEBUG] Extracted JSON from mixed content (regex), length: {len(potential_json)} chars")
-                return potential_json
+                elif debug:
+                    logger.debug("[DEBUG EXTRACTION] Potential JSON failed validation check")
+                    logger.debug("[DEBUG EXTRACTION] First 500 chars: %s", content[json_start:min(json_end + 1, json_start + 500)])
 
         # Method 3: No JSON found - check if this is pure reasoning output (DeepSeek R1 issue)
         # If the content is very long and contains reasoning keywords but no JSON markers,
@@ -144,30 +545,42 @@ class LLMClient(ABC):
         is_reasoning_only = (
             len(content) > 10000 and
             json_start == -1 and
-            any(phrase in content.lower() for phrase in [
-                'i need to analyze', 'let me go through', 'step by step',
-                'first,', 'the score is', 'the user has provided'
-            ])
+            _REASONING_ONLY_RE.search(content) is not None
         )
 
         if is_reasoning_only:
-            print(f"[DEBUG EXTRACTION] Detected pure reasoning output without JSON (DeepSeek R1 issue)")
-            print(f"[DEBUG EXTRACTION] Content length: {len(content)} chars, no JSON found")
-            print(f"[DEBUG EXTRACTION] This model may not support structured output well")
+            logger.debug("[DEBUG EXTRACTION] Detected pure reasoning output without JSON (DeepSeek R1 issue)")
+            logger.debug("[DEBUG EXTRACTION] Content length: %d chars, no JSON found", len(content))
+            logger.debug("[DEBUG EXTRACTION] This model may not support structured output well")
             # Return a helpful error message instead of the raw reasoning
             return content  # Return as-is for now, but flag the issue
 
-        print(f"[DEBUG] No JSON extraction performed")
-        print(f"[DEBUG EXTRACTION] Last 500 chars of content: {content[-500:]}")
+        if debug:
+            logger.debug("[DEBUG] No JSON extraction performed")
+            logger.debug("[DEBUG EXTRACTION] Last 500 chars of content: %s", content[-500:])
         return content
 
 
+# Provider name -> client class, filled in by @register
+PROVIDERS: Dict[str, Type[LLMClient]] = {}
+
+
+def register(provider: str):
+    """Class decorator that makes an LLMClient available to get_llm_client(provider)."""
+    def decorator(cls: Type[LLMClient]) -> Type[LLMClient]:
+        PROVIDERS[provider] = cls
+        return cls
+    return decorator
+
+
+@register("gemini")
 class GeminiClient(LLMClient):
     """Google Gemini API client."""
 
     def __init__(self, model_name: Optional[str] = None):
         """Initialize Gemini client."""
         import google.generativeai as genai
+        from google.api_core import exceptions as google_exceptions
 
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
@@ -176,35 +589,133 @@ class GeminiClient(LLMClient):
         genai.configure(api_key=api_key)
         self.model_name = model_name or os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
         self.model = genai.GenerativeModel(self.model_name)
+        # Sampling settings that never change between calls
+        self._base_gen_config = {"top_p": 0.95, "top_k": 40}
+        self._transient_errors = (
+            google_exceptions.ResourceExhausted,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.DeadlineExceeded,
+        )
+        self._genai = genai
+        # blake2b digest of system_prompt -> (model bound to its context cache or None,
+        # refresh deadline, CachedContent or None), oldest first
+        self._context_caches = collections.OrderedDict()
+        self._context_cache_lock = threading.Lock()
+
+    def _generation_config(self, temperature: float, max_tokens: Optional[int]) -> dict:
+        """Build the generation config (max_tokens defaults to 8192)."""
+        return {
+            **self._base_gen_config,
+            "temperature": temperature,
+            "max_output_tokens": max_tokens if max_tokens is not None else 8192,
+        }
+
+    def _cached_model(self, system_prompt: str):
+        """
+        Return a model bound to a Gemini context cache holding system_prompt.
+
+        Enabled with GEMINI_CONTEXT_CACHE=true. One cache is created per
+        distinct system prompt and kept for GEMINI_CONTEXT_CACHE_TTL_S seconds.
+        Returns None when caching is off or the prompt can't be cached (for
+        example, when it is below the model's minimum cacheable size).
+        """
+        if not env_flag("GEMINI_CONTEXT_CACHE"):
+            return None
+        entry = self._context_caches.get(_prompt_digest(system_prompt))
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        return self._create_cached_model(system_prompt)
+
+    async def _acached_model(self, system_prompt: str):
+        """_cached_model for the async path; cache creation runs in a worker thread."""
+        if not env_flag("GEMINI_CONTEXT_CACHE"):
+            return None
+        entry = self._context_caches.get(_prompt_digest(system_prompt))
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        return await asyncio.to_thread(self._create_cached_model, system_prompt)
+
+    def _create_cached_model(self, system_prompt: str):
+        """Create the context cache for system_prompt (a blocking API call)."""
+        key = _prompt_digest(system_prompt)
+        evicted = []
+        with self._context_cache_lock:
+            # Concurrent callers with the same prompt share one cache
+            now = time.monotonic()
+            entry = self._context_caches.get(key)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+
+            ttl = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL_S", "3600"))
+            cached_content = None
+            try:
+                cached_content = self._genai.caching.CachedContent.create(
+                    model=self.model_name,
+                    system_instruction=system_prompt,
+                    ttl=datetime.timedelta(seconds=ttl),
+                )
+                model = self._genai.GenerativeModel.from_cached_content(cached_content=cached_content)
+            except Exception as e:
+                logger.info("Gemini context cache unavailable, sending full prompts: %s", e)
+                model = None
+
+            # Refresh a minute before the server-side cache expires
+            self._context_caches[key] = (model, now + max(ttl - 60, 0), cached_content)
+            self._context_caches.move_to_end(key)
+            while len(self._context_caches) > _GEMINI_CONTEXT_CACHE_MAX:
+                evicted.append(self._context_caches.popitem(last=False)[1][2])
+
+        # Evicted caches are still billed until their TTL runs out, so delete them
+        for cached_content in evicted:
+            if cached_content is None:
+                continue
+            try:
+                cached_content.delete()
+            except Exception as e:
+                logger.debug("Could not delete evicted Gemini context cache: %s", e)
+        return model
+
+    def _model_and_prompt(self, system_prompt: str, user_prompt: str):
+        """Pick the model to call and the prompt to send it."""
+        return self._pick_model(self._cached_model(system_prompt), system_prompt, user_prompt)
+
+    async def _amodel_and_prompt(self, system_prompt: str, user_prompt: str):
+        """_model_and_prompt without blocking the event loop on cache creation."""
+        model = await self._acached_model(system_prompt)
+        return self._pick_model(model, system_prompt, user_prompt)
+
+    def _pick_model(self, cached_model, system_prompt: str, user_prompt: str):
+        """The cached model with just the user prompt, else the plain model with both."""
+        if cached_model is not None:
+            return cached_model, user_prompt
+        return self.model, f"{system_prompt}\n\n{user_prompt}"
 
     @traceable(name="gemini_generation", tags=["llm", "gemini"])
+    @_retryable
     def generate_with_system_prompt(
         self,
         system_prompt: str,
         user_prompt: str,
         temperature: float = 0.7,
         response_format: dict = None,  # Ignored for Gemini (for interface compatibility)
-        max_tokens: int = None
+        max_tokens: int = None,
+        use_cache: Optional[bool] = None  # None: cache only temperature-0 calls
     ) -> str:
         """Generate using Gemini API."""
-        import time
-
-        combined_prompt = f"{system_prompt}\n\n{user_prompt}"
+        cache_key, cached = self._cache_lookup(
+            "gemini", system_prompt, user_prompt, temperature, use_cache, max_tokens=max_tokens
+        )
+        if cached is not None:
+            return cached
 
-        # Use provided max_tokens or default to 8192
-        if max_tokens is None:
-            max_tokens = 8192
+        model, prompt = self._model_and_prompt(system_prompt, user_prompt)
 
-        start_time = time.time()
+        self._throttle("gemini")
+        start_time = time.monotonic()
         try:
-            response = self.model.generate_content(
-                combined_prompt,
-                generation_config={
-                    "temperature": temperature,
-                    "top_p": 0.95,
-                    "top_k": 40,
-                    "max_output_tokens": max_tokens,
-                }
+            response = model.generate_content(
+                prompt,
+                generation_config=self._generation_config(temperature, max_tokens)
             )
 
             content = response.text
@@ -213,33 +724,55 @@ class GeminiClient(LLMClient):
             content = self._extract_response_from_reasoning_output(content)
 
             # Log to both LangSmith and Langfuse
-            duration_ms = (time.time() - start_time) * 1000
-            log_llm_call(
-                provider="gemini",
-                model=self.model_name,
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                response=content,
-                temperature=temperature,
-                duration_ms=duration_ms,
-            )
+            self._log_call("gemini", system_prompt, user_prompt, temperature, start_time, content)
+            if cache_key:
+                llm_cache.put(cache_key, content)
 
             return content
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
-            log_llm_call(
-                provider="gemini",
-                model=self.model_name,
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                response="",
-                temperature=temperature,
-                duration_ms=duration_ms,
-                error=str(e),
+            self._log_call("gemini", system_prompt, user_prompt, temperature, start_time, error=str(e))
+            raise
+
+    @_retryable
+    async def agenerate_with_system_prompt(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        response_format: dict = None,  # Ignored for Gemini (for interface compatibility)
+        max_tokens: int = None,
+        use_cache: Optional[bool] = None
+    ) -> str:
+        """Generate using Gemini's native async API (generate_content_async)."""
+        cache_key, cached = self._cache_lookup(
+            "gemini", system_prompt, user_prompt, temperature, use_cache, max_tokens=max_tokens
+        )
+        if cached is not None:
+            return cached
+
+        model, prompt = await self._amodel_and_prompt(system_prompt, user_prompt)
+
+        await self._athrottle("gemini")
+        start_time = time.monotonic()
+        try:
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=self._generation_config(temperature, max_tokens)
             )
+
+            content = self._extract_response_from_reasoning_output(response.text)
+
+            self._log_call("gemini", system_prompt, user_prompt, temperature, start_time, content)
+            if cache_key:
+                llm_cache.put(cache_key, content)
+
+            return content
+        except Exception as e:
+            self._log_call("gemini", system_prompt, user_prompt, temperature, start_time, error=str(e))
             raise
 
 
+@register("claude")
 class ClaudeClient(LLMClient):
     """Anthropic Claude API client."""
 
@@ -253,32 +786,49 @@ class ClaudeClient(LLMClient):
                 "Install with: pip install anthropic"
             )
 
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
+        api_keys = _api_keys("ANTHROPIC_API_KEY")
+        if not api_keys:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
 
-        self.client = anthropic.Anthropic(api_key=api_key)
+        # Prompt caching lets repeated system prompts skip re-processing
+        headers = {"anthropic-beta": "prompt-caching-2024-07-31"}
+        self.client = anthropic.Anthropic(api_key=api_keys[0], default_headers=headers)
+        self.async_client = anthropic.AsyncAnthropic(api_key=api_keys[0], default_headers=headers)
+        # Each request takes the next key (ANTHROPIC_API_KEYS). The per-key
+        # copies share the first client's connection pool, and their bound
+        # messages.stream methods are cycled, so a call is one next() away
+        self._send = itertools.cycle([
+            client.messages.stream
+            for client in [self.client] + [self.client.with_options(api_key=key) for key in api_keys[1:]]
+        ])
+        self._asend = itertools.cycle([
+            client.messages.stream
+            for client in [self.async_client] + [self.async_client.with_options(api_key=key) for key in api_keys[1:]]
+        ])
+        self._transient_errors = (
+            anthropic.RateLimitError,
+            anthropic.APIConnectionError,
+            anthropic.APITimeoutError,
+        )
         self.model_name = model_name or os.getenv("CLAUDE_MODEL", "claude-3-5-sonnet-20241022")
 
-    @traceable(name="claude_generation", tags=["llm", "claude"])
-    def generate_with_system_prompt(
+    def _build_request_params(
         self,
         system_prompt: str,
         user_prompt: str,
-        temperature: float = 0.7,
-        response_format: dict = None,
-        max_tokens: int = 8192,
-        thinking_budget: int = None  # Claude extended thinking
-    ) -> str:
-        """Generate using Claude API with optional extended thinking."""
-        import time
-
-        # Build request parameters
+        temperature: float,
+        max_tokens: int,
+        thinking_budget: Optional[int]
+    ) -> dict:
+        """Build messages.create parameters, with extended thinking if a budget is given."""
         request_params = {
             "model": self.model_name,
             "max_tokens": max_tokens,
             "temperature": temperature,
-            "system": system_prompt,
+            # Marked cacheable: the same system prompt is sent with many user prompts
+            "system": [
+                {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+            ],
             "messages": [
                 {"role": "user", "content": user_prompt}
             ]
@@ -290,115 +840,246 @@ class ClaudeClient(LLMClient):
                 "type": "enabled",
                 "budget_tokens": thinking_budget  # e.g., 2000-10000
             }
-            print(f"[DEBUG Claude] Using extended thinking with {thinking_budget} token budget")
+            logger.debug("Using extended thinking with %s token budget", thinking_budget)
 
-        start_time = time.time()
-        try:
-            message = self.client.messages.create(**request_params)
+        return request_params
+
+    @traceable(name="claude_generation", tags=["llm", "claude"])
+    @_retryable
+    def generate_with_system_prompt(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        response_format: dict = None,
+        max_tokens: int = 8192,
+        thinking_budget: int = None,  # Claude extended thinking
+        use_cache: Optional[bool] = None  # None: cache only temperature-0 calls
+    ) -> str:
+        """Generate using Claude API with optional extended thinking."""
+        cache_key, cached = self._cache_lookup(
+            "claude", system_prompt, user_prompt, temperature, use_cache,
+            max_tokens=max_tokens, thinking_budget=thinking_budget
+        )
+        if cached is not None:
+            return cached
+
+        request_params = self._build_request_params(
+            system_prompt, user_prompt, temperature, max_tokens, thinking_budget
+        )
 
-            content = message.content[0].text
+        self._throttle("claude")
+        start_time = time.monotonic()
+        try:
+            # Stream the text so <think> blocks are tracked while tokens arrive
+            acc = _StreamAccumulator()
+            with next(self._send)(**request_params) as stream:
+                for text in stream.text_stream:
+                    acc.feed(text)
 
             # Extract JSON from reasoning output if needed
-            content = self._extract_response_from_reasoning_output(content)
+            content = self._extract_from_stream(acc)
 
             # Log to both LangSmith and Langfuse
-            duration_ms = (time.time() - start_time) * 1000
-            log_llm_call(
-                provider="claude",
-                model=self.model_name,
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                response=content,
-                temperature=temperature,
-                duration_ms=duration_ms,
-            )
+            self._log_call("claude", system_prompt, user_prompt, temperature, start_time, content)
+            if cache_key:
+                llm_cache.put(cache_key, content)
 
             return content
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
-            log_llm_call(
-                provider="claude",
-                model=self.model_name,
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                response="",
-                temperature=temperature,
-                duration_ms=duration_ms,
-                error=str(e),
-            )
+            self._log_call("claude", system_prompt, user_prompt, temperature, start_time, error=str(e))
+            raise
+
+    @_retryable
+    async def agenerate_with_system_prompt(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        response_format: dict = None,
+        max_tokens: int = 8192,
+        thinking_budget: int = None,
+        use_cache: Optional[bool] = None
+    ) -> str:
+        """Generate using the AsyncAnthropic client."""
+        cache_key, cached = self._cache_lookup(
+            "claude", system_prompt, user_prompt, temperature, use_cache,
+            max_tokens=max_tokens, thinking_budget=thinking_budget
+        )
+        if cached is not None:
+            return cached
+
+        request_params = self._build_request_params(
+            system_prompt, user_prompt, temperature, max_tokens, thinking_budget
+        )
+
+        await self._athrottle("claude")
+        start_time = time.monotonic()
+        try:
+            acc = _StreamAccumulator()
+            async with next(self._asend)(**request_params) as stream:
+                async for text in stream.text_stream:
+                    acc.feed(text)
+
+            content = self._extract_from_stream(acc)
+
+            self._log_call("claude", system_prompt, user_prompt, temperature, start_time, content)
+            if cache_key:
+                llm_cache.put(cache_key, content)
+
+            return content
+        except Exception as e:
+            self._log_call("claude", system_prompt, user_prompt, temperature, start_time, error=str(e))
             raise
 
 
+# CUSTOM_LLM_API_KEY -> (httpx.Client, httpx.AsyncClient), see _shared_http_clients
+_http_clients: Dict[str, tuple] = {}
+_http_clients_lock = threading.Lock()
+
+
+def _shared_http_clients(api_key: str) -> tuple:
+    """
+    Return the (sync, async) httpx clients for one CUSTOM_LLM_API_KEY.
+
+    Shared by every CustomLLMClient using that key, so all models served by
+    the same vLLM endpoint draw on one pool of keep-alive connections.
+    """
+    with _http_clients_lock:
+        clients = _http_clients.get(api_key)
+        if clients is None:
+            clients = _http_clients[api_key] = _build_http_clients(api_key)
+        return clients
+
+
+def _build_http_clients(api_key: str) -> tuple:
+    """Create the pooled httpx clients, with the X-API-Key auth hook."""
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError(
+            "Required packages not installed. "
+            "Install with: pip install openai httpx"
+        )
+
+    # Event hooks to modify headers
+    def add_api_key_header(request: httpx.Request):
+        """Event hook to add X-API-Key header and remove Authorization."""
+        # Remove Authorization header if present (OpenAI SDK adds this by default)
+        if "Authorization" in request.headers:
+            del request.headers["Authorization"]
+        # Add X-API-Key header for vLLM authentication
+        request.headers["X-API-Key"] = api_key
+
+    async def add_api_key_header_async(request: httpx.Request):
+        """Async event hook (httpx.AsyncClient requires coroutine hooks)."""
+        add_api_key_header(request)
+
+    # Pooled keep-alive connections, HTTP/2 when the h2 package is installed
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    transport_options = {
+        "http2": http2,
+        "limits": httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0),
+        "timeout": httpx.Timeout(connect=5.0, read=300.0, write=10.0, pool=5.0),
+    }
+
+    return (
+        httpx.Client(event_hooks={"request": [add_api_key_header]}, **transport_options),
+        httpx.AsyncClient(event_hooks={"request": [add_api_key_header_async]}, **transport_options),
+    )
+
+
+@register("custom")
 class CustomLLMClient(LLMClient):
     """Custom LLM API client (OpenAI-compatible)."""
 
     def __init__(self, model_name: Optional[str] = None):
         """Initialize custom LLM client."""
         try:
-            from openai import OpenAI
-            import httpx
+            from openai import (
+                APIConnectionError, APIStatusError, APITimeoutError, AsyncOpenAI, OpenAI, RateLimitError
+            )
         except ImportError:
             raise ImportError(
                 "Required packages not installed. "
                 "Install with: pip install openai httpx"
             )
 
-        api_key = os.getenv("CUSTOM_LLM_API_KEY")
+        api_keys = _api_keys("CUSTOM_LLM_API_KEY")
         base_url = os.getenv("CUSTOM_LLM_BASE_URL")
 
-        if not api_key:
+        if not api_keys:
             raise ValueError("CUSTOM_LLM_API_KEY not found in environment variables")
         if not base_url:
             raise ValueError("CUSTOM_LLM_BASE_URL not found in environment variables")
 
-        # Create a custom httpx client with event hooks to modify headers
-        def add_api_key_header(request: httpx.Request):
-            """Event hook to add X-API-Key header and remove Authorization."""
-            # Remove Authorization header if present (OpenAI SDK adds this by default)
-            if "Authorization" in request.headers:
-                del request.headers["Authorization"]
-            # Add X-API-Key header for vLLM authentication
-            request.headers["X-API-Key"] = api_key
-
-        # Create custom httpx client with request hook
-        http_client = httpx.Client(
-            event_hooks={"request": [add_api_key_header]}
-        )
-
-        # Create OpenAI client with custom http client
-        self.client = OpenAI(
-            api_key="dummy",  # Dummy value - will be removed by hook
-            base_url=base_url,
-            http_client=http_client
-        )
+        self.base_url = base_url
+        # Kept on the instance so the retry loops don't re-import it per call
+        self._api_status_error = APIStatusError
+        self._transient_errors = (RateLimitError, APIConnectionError, APITimeoutError)
+
+        # Create OpenAI clients over the shared httpx clients for each key
+        clients, async_clients = [], []
+        for api_key in api_keys:
+            http_client, async_http_client = _shared_http_clients(api_key)
+            clients.append(OpenAI(
+                api_key="dummy",  # Dummy value - will be removed by hook
+                base_url=base_url,
+                http_client=http_client
+            ))
+            async_clients.append(AsyncOpenAI(
+                api_key="dummy",
+                base_url=base_url,
+                http_client=async_http_client
+            ))
+        self.client = clients[0]
+        self.async_client = async_clients[0]
+        # Each request takes the next key (CUSTOM_LLM_API_KEYS); the bound
+        # create methods are cycled, so a call is one next() away
+        self._send = itertools.cycle([client.chat.completions.create for client in clients])
+        self._asend = itertools.cycle([client.chat.completions.create for client in async_clients])
         self.model_name = model_name or os.getenv("CUSTOM_LLM_MODEL", "default-model")
-
-    @traceable(name="custom_llm_generation", tags=["llm", "custom"])
-    def generate_with_system_prompt(
-        self,
-        system_prompt: str,
-        user_prompt: str,
-        temperature: float = 0.7,
-        response_format: dict = None,
-        max_tokens: int = None,  # Auto-calculate if None
-        max_retries: int = None,  # Max retry attempts for 503 errors (from env)
-        initial_retry_delay: float = None  # Initial delay in seconds (from env)
-    ) -> str:
-        """Generate using custom LLM API with optional structured output and retry logic."""
-        import time
-        from openai import APIStatusError
-
-        start_time = time.time()
-
-        # Get retry settings from environment variables
+        # Request fields fixed for the life of the client
+        self._base_request_params = {"model": self.model_name}
+
+    @classmethod
+    async def close(cls):
+        """Close the shared connection pools (call once at shutdown)."""
+        with _http_clients_lock:
+            clients = list(_http_clients.values())
+            _http_clients.clear()
+        # Cached clients still hold the pools being closed; later
+        # get_llm_client() calls build new ones on fresh pools
+        reset_llm_client()
+        for http_client, async_http_client in clients:
+            http_client.close()
+            await async_http_client.aclose()
+
+    @staticmethod
+    def _retry_settings(max_retries: Optional[int], initial_retry_delay: Optional[float]):
+        """Fill in retry settings from environment variables where not given."""
         if max_retries is None:
             max_retries = int(os.getenv("CUSTOM_LLM_MAX_RETRIES", "5"))
         if initial_retry_delay is None:
             initial_retry_delay = float(os.getenv("CUSTOM_LLM_INITIAL_RETRY_DELAY", "5.0"))
+        return max_retries, initial_retry_delay
 
-        # Estimate input tokens (rough approximation: 1 token ≈ 4 characters)
+    def _build_request_params(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        response_format: Optional[dict],
+        max_tokens: Optional[int]
+    ) -> dict:
+        """Build chat.completions parameters, fitting max_tokens to the context window."""
+        # Count input tokens (tiktoken when installed, else 1 token ≈ 4 characters)
         input_text = system_prompt + user_prompt
-        estimated_input_tokens = len(input_text) // 4
+        estimated_input_tokens = _count_tokens(input_text, self.model_name)
 
         # Get model context limit from environment or use default
         model_context_limit = int(os.getenv("CUSTOM_LLM_CONTEXT_LIMIT", "32768"))
@@ -410,19 +1091,20 @@ class CustomLLMClient(LLMClient):
             max_tokens = int(available_tokens * 0.8)
             # Ensure it's within reasonable bounds
             max_tokens = max(512, min(max_tokens, 16384))
-            print(f"[DEBUG CustomLLM] Auto-calculated max_tokens: {max_tokens} "
-                  f"(estimated input: {estimated_input_tokens}, limit: {model_context_limit})")
+            logger.debug("Auto-calculated max_tokens: %d (estimated input: %d, limit: %d)",
+                         max_tokens, estimated_input_tokens, model_context_limit)
         else:
             # Validate provided max_tokens doesn't exceed available space
             available_tokens = model_context_limit - estimated_input_tokens
             if max_tokens > available_tokens:
-                print(f"[WARNING CustomLLM] Requested max_tokens ({max_tokens}) exceeds available space ({available_tokens})")
+                requested = max_tokens
                 max_tokens = max(512, int(available_tokens * 0.8))
-                print(f"[WARNING CustomLLM] Adjusted max_tokens to: {max_tokens}")
+                logger.warning("Requested max_tokens (%s) exceeds available space (%d); using %d",
+                               requested, available_tokens, max_tokens)
 
         # Build request parameters
         request_params = {
-            "model": self.model_name,
+            **self._base_request_params,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -434,110 +1116,164 @@ class CustomLLMClient(LLMClient):
         # Add response_format if provided (for structured output)
         if response_format:
             request_params["response_format"] = response_format
-            print(f"[DEBUG CustomLLM] Using structured output with response_format")
+            logger.debug("Using structured output with response_format")
 
-        print(f"[DEBUG CustomLLM] Requesting max_tokens: {max_tokens}")
+        logger.debug("Requesting max_tokens: %s", max_tokens)
 
-        # Retry loop for handling 503 errors (server warm-up)
-        last_error = None
-        for attempt in range(max_retries):
-            try:
-                response = self.client.chat.completions.create(**request_params)
-                # Success! Break out of retry loop
-                break
-            except APIStatusError as e:
-                last_error = e
-                # Check if it's a 503 (service unavailable) - server warming up
-                if e.status_code == 503:
-                    if attempt < max_retries - 1:
-                        # Calculate exponential backoff delay
-                        delay = initial_retry_delay * (2 ** attempt)
-                        print(f"\n{'='*60}")
-                        print(f"[INFO] vLLM server is warming up (503 error)")
-                        print(f"[INFO] Attempt {attempt + 1}/{max_retries}")
-                        print(f"[INFO] Retrying in {delay:.1f} seconds...")
-                        print(f"{'='*60}\n")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        print(f"\n{'='*60}")
-                        print(f"[ERROR] vLLM server still unavailable after {max_retries} attempts")
-                        print(f"[ERROR] The server may need more time to warm up")
-                        print(f"[ERROR] Please wait a minute and try again")
-                        print(f"{'='*60}\n")
-                        raise Exception(
-                            f"vLLM server unavailable after {max_retries} attempts. "
-                            f"The server is still warming up. Please wait a minute and try again."
-                        ) from e
-                else:
-                    # Not a 503 error, re-raise immediately
-                    print(f"\n{'='*60}")
-                    print(f"[ERROR] vLLM API Error (HTTP {e.status_code})")
-                    print(f"[ERROR] Message: {str(e)}")
-                    print(f"[ERROR] Check your CUSTOM_LLM_BASE_URL and CUSTOM_LLM_API_KEY")
-                    print(f"{'='*60}\n")
-                    raise
-            except Exception as e:
-                # Connection and other non-API errors
-                print(f"\n{'='*60}")
-                print(f"[ERROR] Connection Error to vLLM Server")
-                print(f"[ERROR] Error type: {type(e).__name__}")
-                print(f"[ERROR] Error message: {str(e)}")
-                print(f"[ERROR] Base URL: {base_url}")
-                print(f"[ERROR] \nPossible causes:")
-                print(f"[ERROR] 1. vLLM server is not running or has been stopped")
-                print(f"[ERROR] 2. Invalid or expired CUSTOM_LLM_BASE_URL")
-                print(f"[ERROR] 3. Invalid CUSTOM_LLM_API_KEY")
-                print(f"[ERROR] 4. Network connectivity issue")
-                print(f"[ERROR] \nSolution: Switch to 'gemini' provider in the sidebar")
-                print(f"{'='*60}\n")
-                # Non-API errors are not retried
-                raise
+        return request_params
+
+    def _retry_delay(self, e, attempt: int, max_retries: int, initial_retry_delay: float) -> float:
+        """
+        Decide how to handle an API status error from the server.
+
+        Returns:
+            Seconds to wait before the next attempt (503 while retries remain)
+
+        Raises:
+            The error itself for non-503 statuses, or a wrapped error once
+            retries are exhausted
+        """
+        # Check if it's a 503 (service unavailable) - server warming up
+        if e.status_code == 503:
+            if attempt < max_retries - 1:
+                # Jittered exponential backoff, so clients retrying a restarted
+                # server don't all come back at the same moment
+                max_delay = float(os.getenv("CUSTOM_LLM_MAX_RETRY_DELAY", "60.0"))
+                delay = min(max_delay, initial_retry_delay * (1 << attempt) * random.uniform(0.5, 1.5))
+                # Wait at least as long as the server asked for, up to the cap
+                retry_after = self._retry_after(e)
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, max_delay))
+                logger.warning("vLLM server is warming up (503), attempt %d/%d; retrying in %.1fs",
+                               attempt + 1, max_retries, delay)
+                _print_banner(
+                    f"[INFO] vLLM server is warming up (503 error)",
+                    f"[INFO] Attempt {attempt + 1}/{max_retries}",
+                    f"[INFO] Retrying in {delay:.1f} seconds...",
+                )
+                return delay
+            logger.error("vLLM server unavailable after %d attempts (status=%s): %s",
+                         max_retries, e.status_code, e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            _print_banner(
+                f"[ERROR] vLLM server still unavailable after {max_retries} attempts",
+                f"[ERROR] The server may need more time to warm up",
+                f"[ERROR] Please wait a minute and try again",
+            )
+            raise Exception(
+                f"vLLM server unavailable after {max_retries} attempts. "
+                f"The server is still warming up. Please wait a minute and try again."
+            ) from e
+
+        # Not a 503 error, re-raise immediately
+        logger.error("vLLM API error (HTTP %s): %s; check CUSTOM_LLM_BASE_URL and CUSTOM_LLM_API_KEY",
+                     e.status_code, e)
+        _print_banner(
+            f"[ERROR] vLLM API Error (HTTP {e.status_code})",
+            f"[ERROR] Message: {str(e)}",
+            f"[ERROR] Check your CUSTOM_LLM_BASE_URL and CUSTOM_LLM_API_KEY",
+        )
+        raise e
+
+    @staticmethod
+    def _retry_after(e) -> Optional[float]:
+        """Seconds from the error response's Retry-After header, if it sent one."""
+        response = getattr(e, "response", None)
+        value = response.headers.get("Retry-After") if response is not None else None
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            # HTTP-date form; not worth parsing for a warming-up server
+            return None
+
+    def _retries_exhausted(self, e: Exception):
+        """Report a rate limit or connection failure that outlasted every retry."""
+        if isinstance(e, self._api_status_error):
+            logger.error("vLLM API still rate limiting (HTTP %s) after retries: %s", e.status_code, e)
         else:
-            # This shouldn't happen, but just in case
-            if last_error:
-                raise last_error
-            raise Exception("Unknown error during API call")
+            self._report_connection_error(e)
+
+    def _report_connection_error(self, e: Exception):
+        """Log diagnostics for connection and other non-API errors."""
+        logger.error(
+            "Connection error to vLLM server at %s (%s: %s). The server may be stopped, "
+            "CUSTOM_LLM_BASE_URL or CUSTOM_LLM_API_KEY may be invalid, or the network is down; "
+            "switching to the 'gemini' provider avoids it",
+            self.base_url, type(e).__name__, e
+        )
+        _print_banner(
+            f"[ERROR] Connection Error to vLLM Server",
+            f"[ERROR] Error type: {type(e).__name__}",
+            f"[ERROR] Error message: {str(e)}",
+            f"[ERROR] Base URL: {self.base_url}",
+            f"[ERROR] \nPossible causes:",
+            f"[ERROR] 1. vLLM server is not running or has been stopped",
+            f"[ERROR] 2. Invalid or expired CUSTOM_LLM_BASE_URL",
+            f"[ERROR] 3. Invalid CUSTOM_LLM_API_KEY",
+            f"[ERROR] 4. Network connectivity issue",
+            f"[ERROR] \nSolution: Switch to 'gemini' provider in the sidebar",
+        )
 
-        content = response.choices[0].message.content
-        finish_reason = response.choices[0].finish_reason
+    @staticmethod
+    def _read_chunk(acc: _StreamAccumulator, chunk) -> Optional[str]:
+        """Feed one streamed completion chunk; returns its finish_reason, if any."""
+        if not chunk.choices:
+            return None
+        choice = chunk.choices[0]
+        acc.feed(choice.delta.content)
+        return choice.finish_reason
+
+    def _process_response(
+        self,
+        acc: _StreamAccumulator,
+        finish_reason: Optional[str],
+        max_tokens: int,
+        response_format: Optional[dict]
+    ) -> str:
+        """Check finish_reason, repair truncated JSON and extract the final output."""
+        content = acc.text
+        repaired = False
+        output_tokens = _count_tokens(content, self.model_name)
 
         # Debug: Show finish reason and response stats
-        print(f"[DEBUG CustomLLM] finish_reason: {finish_reason}")
-        print(f"[DEBUG CustomLLM] Response length: {len(content)} chars (~{len(content)//4} tokens)")
-
-        # Check for suspiciously short structured output responses
-        if response_format and finish_reason == "stop" and len(content) < 2000:
-            print(f"\n{'='*60}")
-            print(f"[WARNING] INCOMPLETE STRUCTURED OUTPUT DETECTED")
-            print(f"{'='*60}")
-            print(f"Response is suspiciously short ({len(content)} chars) for structured output.")
-            print(f"This model may not support structured output well.")
-            print(f"\nRECOMMENDATIONS:")
-            print(f"1. Switch to Gemini (gemini-2.0-flash-exp) - BEST OPTION")
-            print(f"2. Switch to Claude (claude-sonnet-4-5) - EXCELLENT")
-            print(f"3. Use a larger model (DeepSeek-V3, not R1-1.5B)")
-            print(f"4. Check vLLM server --max-model-len configuration")
-            print(f"{'='*60}\n")
+        logger.debug("[DEBUG CustomLLM] finish_reason: %s", finish_reason)
+        logger.debug("[DEBUG CustomLLM] Response length: %d chars (~%d tokens)", len(content), output_tokens)
+
+        # Check for suspiciously short structured output responses (~2000 chars)
+        if response_format and finish_reason == "stop" and output_tokens < 500:
+            logger.warning("Incomplete structured output: only %d chars; this model may not support "
+                           "structured output well (Gemini or Claude are more reliable)", len(content))
+            _print_banner(
+                f"[WARNING] INCOMPLETE STRUCTURED OUTPUT DETECTED",
+                f"Response is suspiciously short ({len(content)} chars) for structured output.",
+                f"This model may not support structured output well.",
+                f"\nRECOMMENDATIONS:",
+                f"1. Switch to Gemini (gemini-2.0-flash-exp) - BEST OPTION",
+                f"2. Switch to Claude (claude-sonnet-4-5) - EXCELLENT",
+                f"3. Use a larger model (DeepSeek-V3, not R1-1.5B)",
+                f"4. Check vLLM server --max-model-len configuration",
+            )
 
         # Check if response was truncated
         if finish_reason == "length":
-            estimated_tokens = len(content) // 4
-            print(f"\n{'='*60}")
-            print(f"[ERROR] RESPONSE TRUNCATED BY SERVER")
-            print(f"{'='*60}")
-            print(f"Requested: {max_tokens} tokens")
-            print(f"Received: ~{estimated_tokens} tokens (~{len(content)} chars)")
-            print(f"\nThis is a vLLM server limitation, NOT a client issue.")
-            print(f"\nRECOMMENDATIONS:")
-            print(f"1. Switch to Gemini or Claude (no truncation issues)")
-            print(f"2. Reconfigure vLLM with higher --max-model-len")
-            print(f"3. Use a larger model (DeepSeek-V3 instead of R1-1.5B)")
-            print(f"{'='*60}\n")
+            logger.error("Response truncated by server: requested %d tokens, received ~%d (%d chars); "
+                         "raise vLLM --max-model-len or switch to Gemini/Claude",
+                         max_tokens, output_tokens, len(content))
+            _print_banner(
+                f"[ERROR] RESPONSE TRUNCATED BY SERVER",
+                f"Requested: {max_tokens} tokens",
+                f"Received: ~{output_tokens} tokens (~{len(content)} chars)",
+                f"\nThis is a vLLM server limitation, NOT a client issue.",
+                f"\nRECOMMENDATIONS:",
+                f"1. Switch to Gemini or Claude (no truncation issues)",
+                f"2. Reconfigure vLLM with higher --max-model-len",
+                f"3. Use a larger model (DeepSeek-V3 instead of R1-1.5B)",
+            )
 
             # For now, try to salvage what we have by adding closing braces
             if not content.rstrip().endswith('}'):
-                print(f"[INFO] Attempting to repair truncated JSON...")
+                logger.info("Attempting to repair truncated JSON...")
                 # This is a hack but might help in some cases
                 content = content.rstrip()
                 # Count open vs closed braces
@@ -546,136 +1282,327 @@ class CustomLLMClient(LLMClient):
                 if open_braces > close_braces:
                     # Try to close the JSON
                     content += '\n}' * (open_braces - close_braces)
-                    print(f"[INFO] Added {open_braces - close_braces} closing braces")
+                    repaired = True
+                    logger.info("Added %d closing braces", open_braces - close_braces)
 
-        # Debug: Show original response length (handle encoding safely)
-        try:
-            print(f"[DEBUG CustomLLM] Raw response length: {len(content)} chars")
-            print(f"[DEBUG CustomLLM] Response starts with: {content[:200]}")
-        except UnicodeEncodeError:
-            print(f"[DEBUG CustomLLM] Raw response length: {len(content)} chars")
-            print(f"[DEBUG CustomLLM] Response starts with: [Unicode content - cannot display]")
+        # Debug: Show original response length (slice only taken when DEBUG is on;
+        # logging handles unencodable characters itself)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("[DEBUG CustomLLM] Raw response length: %d chars", len(content))
+            logger.debug("[DEBUG CustomLLM] Response starts with: %s", content[:200])
 
         # Post-process response to extract actual output from reasoning models
-        content = self._extract_response_from_reasoning_output(content)
+        if repaired:
+            content = self._extract_response_from_reasoning_output(content)
+        else:
+            content = self._extract_from_stream(acc)
 
-        try:
-            print(f"[DEBUG CustomLLM] After extraction: {len(content)} chars")
-            print(f"[DEBUG CustomLLM] Extracted starts with: {content[:200]}")
-        except UnicodeEncodeError:
-            print(f"[DEBUG CustomLLM] After extraction: {len(content)} chars")
-            print(f"[DEBUG CustomLLM] Extracted starts with: [Unicode content - cannot display]")
+        if debug:
+            logger.debug("[DEBUG CustomLLM] After extraction: %d chars", len(content))
+            logger.debug("[DEBUG CustomLLM] Extracted starts with: %s", content[:200])
+
+        return content
+
+    @traceable(name="custom_llm_generation", tags=["llm", "custom"])
+    @_retryable
+    def generate_with_system_prompt(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        response_format: dict = None,
+        max_tokens: int = None,  # Auto-calculate if None
+        max_retries: int = None,  # Max retry attempts for 503 errors (from env)
+        initial_retry_delay: float = None,  # Initial delay in seconds (from env)
+        use_cache: Optional[bool] = None  # None: cache only temperature-0 calls
+    ) -> str:
+        """Generate using custom LLM API with optional structured output and retry logic."""
+        cache_key, cached = self._cache_lookup(
+            "custom", system_prompt, user_prompt, temperature, use_cache,
+            max_tokens=max_tokens, response_format=response_format
+        )
+        if cached is not None:
+            return cached
+
+        self._throttle("custom")
+        start_time = time.monotonic()
+
+        max_retries, initial_retry_delay = self._retry_settings(max_retries, initial_retry_delay)
+        request_params = self._build_request_params(
+            system_prompt, user_prompt, temperature, response_format, max_tokens
+        )
+
+        # Retry loop for handling 503 errors (server warm-up)
+        for attempt in range(max_retries):
+            try:
+                stream = next(self._send)(**request_params, stream=True)
+                # Success! Break out of retry loop
+                break
+            except self._transient_errors:
+                # Rate limits, dropped connections, timeouts: retried by _retryable
+                raise
+            except self._api_status_error as e:
+                time.sleep(self._retry_delay(e, attempt, max_retries, initial_retry_delay))
+            except Exception as e:
+                self._report_connection_error(e)
+                # Non-API errors are not retried
+                raise
+        else:
+            # Only reached when max_retries < 1
+            raise Exception("Unknown error during API call")
+
+        # Track <think> blocks while tokens arrive
+        acc = _StreamAccumulator()
+        finish_reason = None
+        for chunk in stream:
+            finish_reason = self._read_chunk(acc, chunk) or finish_reason
+
+        content = self._process_response(acc, finish_reason, request_params["max_tokens"], response_format)
 
         # Log to both LangSmith and Langfuse
-        duration_ms = (time.time() - start_time) * 1000
-        log_llm_call(
-            provider="custom",
-            model=self.model_name,
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            response=content,
-            temperature=temperature,
-            duration_ms=duration_ms,
+        self._log_call("custom", system_prompt, user_prompt, temperature, start_time, content)
+        if cache_key:
+            llm_cache.put(cache_key, content)
+
+        return content
+
+    @_retryable
+    async def agenerate_with_system_prompt(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        response_format: dict = None,
+        max_tokens: int = None,
+        max_retries: int = None,
+        initial_retry_delay: float = None,
+        use_cache: Optional[bool] = None
+    ) -> str:
+        """Generate using the AsyncOpenAI client, with the same retry handling."""
+        cache_key, cached = self._cache_lookup(
+            "custom", system_prompt, user_prompt, temperature, use_cache,
+            max_tokens=max_tokens, response_format=response_format
         )
+        if cached is not None:
+            return cached
+
+        await self._athrottle("custom")
+        start_time = time.monotonic()
+
+        max_retries, initial_retry_delay = self._retry_settings(max_retries, initial_retry_delay)
+        request_params = self._build_request_params(
+            system_prompt, user_prompt, temperature, response_format, max_tokens
+        )
+
+        for attempt in range(max_retries):
+            try:
+                stream = await next(self._asend)(**request_params, stream=True)
+                break
+            except self._transient_errors:
+                raise
+            except self._api_status_error as e:
+                await asyncio.sleep(self._retry_delay(e, attempt, max_retries, initial_retry_delay))
+            except Exception as e:
+                self._report_connection_error(e)
+                raise
+        else:
+            raise Exception("Unknown error during API call")
+
+        acc = _StreamAccumulator()
+        finish_reason = None
+        async for chunk in stream:
+            finish_reason = self._read_chunk(acc, chunk) or finish_reason
+
+        content = self._process_response(acc, finish_reason, request_params["max_tokens"], response_format)
+
+        self._log_call("custom", system_prompt, user_prompt, temperature, start_time, content)
+        if cache_key:
+            llm_cache.put(cache_key, content)
 
         return content
 
-    def _extract_response_from_reasoning_output(self, content: str) -> str:
+
+class BatchLLMClient(ABC):
+    """
+    Interface for provider batch APIs (offline jobs, no latency guarantee).
+
+    For bulk scoring runs: the provider queues the whole job and bills it
+    at its batch discount. Interactive code should keep using LLMClient.
+    """
+
+    @abstractmethod
+    def submit_batch(
+        self,
+        prompts: List[Tuple[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
         """
-        Extract actual response from reasoning model output.
+        Submit (system_prompt, user_prompt) pairs as one batch job.
 
-        Handles various reasoning model formats:
-        - DeepSeek R1: <think>...</think> tags
-        - Other reasoning models: May have thinking followed by structured output
+        Returns:
+            Provider job id, to pass to poll()
+        """
+        pass
 
-        Args:
-            content: Raw model output
+    @abstractmethod
+    def poll(self, job_id: str) -> Optional[List[Optional[str]]]:
+        """
+        Check a batch job.
 
         Returns:
-            Cleaned response with thinking removed
+            None while the job is still running, otherwise the responses in
+            submission order (None for any request that failed)
         """
-        import re
+        pass
 
-        print(f"[DEBUG EXTRACTION] Starting extraction, content length: {len(content)} chars")
-        print(f"[DEBUG EXTRACTION] Content starts with: {content[:100]}")
 
-        # Method 1: Handle explicit thinking tags (DeepSeek R1, etc.)
-        if "<think>" in content and "</think>" in content:
-            # Extract everything after the last closing </think> tag
-            parts = content.split("</think>")
-            if len(parts) > 1:
-                extracted = parts[-1].strip()
-                print(f"[DEBUG] Stripped <think> tags, response length: {len(extracted)} chars")
-                return extracted
+class ClaudeBatchClient(BatchLLMClient):
+    """Anthropic Message Batches API."""
 
-        # Method 2: Try to extract JSON from mixed content
-        # If response starts with non-JSON text but contains JSON, extract it
-        content_stripped = content.strip()
-
-        # Check if response starts with JSON
-        if content_stripped.startswith('{') or content_stripped.startswith('['):
-            return content  # Already clean JSON
-
-        # Try to find JSON object in the response - use greedy match to get complete JSON
-        # Look for the first { and try to match to the last }
-        json_start = content.find('{')
-        print(f"[DEBUG EXTRACTION] json_start position: {json_start}")
-
-        # Also check for common markers that might indicate where JSON starts
-        json_markers = [
-            'json\n{', 'JSON:\n{', '```json',
-            'Here is the JSON', 'Here\'s the JSON',
-            'The JSON response', 'Final response:',
-            '"score":', "'score':"
+    def __init__(self, model_name: Optional[str] = None):
+        """Initialize on top of a regular ClaudeClient (same key and model)."""
+        self._client = ClaudeClient(model_name)
+        self.model_name = self._client.model_name
+
+    def submit_batch(
+        self,
+        prompts: List[Tuple[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Submit the prompts with messages.batches.create."""
+        requests = [
+            {
+                "custom_id": f"req-{i}",
+                "params": self._client._build_request_params(
+                    system_prompt, user_prompt, temperature, max_tokens or 8192, None
+                ),
+            }
+            for i, (system_prompt, user_prompt) in enumerate(prompts)
         ]
-        for marker in json_markers:
-            marker_pos = content.lower().find(marker.lower())
-            if marker_pos != -1:
-                print(f"[DEBUG EXTRACTION] Found marker '{marker}' at position {marker_pos}")
-                # Look for { after this marker
-                temp_start = content.find('{', marker_pos)
-                if temp_start != -1 and (json_start == -1 or temp_start < json_start):
-                    json_start = temp_start
-                    print(f"[DEBUG EXTRACTION] Updated json_start to {json_start}")
+        batch = self._client.client.messages.batches.create(requests=requests)
+        logger.info("Submitted Claude batch %s (%d requests)", batch.id, len(requests))
+        return batch.id
+
+    def poll(self, job_id: str) -> Optional[List[Optional[str]]]:
+        """Return the responses once the batch has ended."""
+        batches = self._client.client.messages.batches
+        batch = batches.retrieve(job_id)
+        if batch.processing_status != "ended":
+            return None
+
+        counts = batch.request_counts
+        responses = [None] * (counts.succeeded + counts.errored + counts.canceled + counts.expired)
+        for entry in batches.results(job_id):
+            if entry.result.type != "succeeded":
+                logger.warning("Claude batch %s: %s %s", job_id, entry.custom_id, entry.result.type)
+                continue
+            text = "".join(
+                block.text for block in entry.result.message.content if block.type == "text"
+            )
+            index = int(entry.custom_id.split("-", 1)[1])
+            responses[index] = self._client._extract_response_from_reasoning_output(text)
+        return responses
 
-        if json_start != -1:
-            # Find the matching closing brace
-            json_end = content.rfind('}')
-            print(f"[DEBUG EXTRACTION] json_end position: {json_end}")
-            if json_end != -1 and json_end > json_start:
-                potential_json = content[json_start:json_end + 1]
-                print(f"[DEBUG EXTRACTION] Potential JSON length: {len(potential_json)} chars")
-                print("[DEBUG EXTRACTION] Contains 'score':", '"score"' in potential_json)
-                print("[DEBUG EXTRACTION] Contains 'analysis':", '"analysis"' in potential_json)
-                print("[DEBUG EXTRACTION] Contains 'suggestions':", '"suggestions"' in potential_json)
-                # Verify it looks like valid JSON structure
-                if '"score"' in potential_json or '"analysis"' in potential_json or '"suggestions"' in potential_json:
-                    print(f"[DEBUG] Extracted JSON from mixed content (full match), length: {len(potential_json)} chars")
-                    return potential_json
-                else:
-                    print(f"[DEBUG EXTRACTION] Potential JSON failed validation check")
-                    print(f"[DEBUG EXTRACTION] First 500 chars: {potential_json[:500]}")
-
-        # Fallback: Try regex approach for complex cases
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
-            potential_json = json_match.group(0)
-            # Verify it looks like valid JSON structure
-            if '"score"' in potential_json or '"analysis"' in potential_json:
-                print(f"[DEBUG] Extracted JSON from mixed content (regex), length: {len(potential_json)} chars")
-                return potential_json
 
-        # Method 3: No special handling needed
-        print(f"[DEBUG] No JSON extraction needed, returning original content")
-        return content
+class CustomBatchClient(BatchLLMClient):
+    """OpenAI-compatible Batch API (/v1/batches) for the custom provider."""
+
+    def __init__(self, model_name: Optional[str] = None):
+        """Initialize on top of a regular CustomLLMClient (same server and key)."""
+        self._client = CustomLLMClient(model_name)
+        self.model_name = self._client.model_name
+
+    def submit_batch(
+        self,
+        prompts: List[Tuple[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Upload the prompts as a JSONL file and create a batch over it."""
+        lines = (
+            json.dumps({
+                "custom_id": f"req-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._client._build_request_params(
+                    system_prompt, user_prompt, temperature, None, max_tokens
+                ),
+            })
+            for i, (system_prompt, user_prompt) in enumerate(prompts)
+        )
+        input_file = self._client.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self._client.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("Submitted batch %s (%d requests)", batch.id, len(prompts))
+        return batch.id
+
+    def poll(self, job_id: str) -> Optional[List[Optional[str]]]:
+        """Return the responses once the batch has completed."""
+        client = self._client.client
+        batch = client.batches.retrieve(job_id)
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise Exception(f"Batch {job_id} {batch.status}")
+        if batch.status != "completed":
+            return None
+
+        responses = [None] * batch.request_counts.total
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line:
+                continue
+            entry = json.loads(line)
+            index = int(entry["custom_id"].split("-", 1)[1])
+            response = entry.get("response") or {}
+            if entry.get("error") or response.get("status_code") != 200:
+                logger.warning("Batch %s: %s failed: %s", job_id, entry["custom_id"], entry.get("error"))
+                continue
+            content = response["body"]["choices"][0]["message"]["content"] or ""
+            responses[index] = self._client._extract_response_from_reasoning_output(content)
+        return responses
+
+
+async def generate_many(
+    client: LLMClient,
+    pairs: List[Tuple[str, str]],
+    temperature: float = 0.7
+) -> list:
+    """
+    Run several (system_prompt, user_prompt) pairs concurrently.
+
+    Total wall time is roughly that of the slowest call rather than the sum.
+
+    Args:
+        client: Any LLMClient
+        pairs: List of (system_prompt, user_prompt) tuples
+        temperature: Sampling temperature
+
+    Returns:
+        Responses in the same order as pairs; a failed call yields its exception
+    """
+    return await asyncio.gather(
+        *(client.agenerate_with_system_prompt(s, u, temperature) for s, u in pairs),
+        return_exceptions=True
+    )
 
 
 def get_llm_client(provider: str = "gemini", model_name: Optional[str] = None) -> LLMClient:
     """
     Factory function to get appropriate LLM client.
 
+    Clients are shared per (provider, model_name) for the life of the process,
+    so SDK setup and connection pools are reused; reset_llm_client() drops them.
+
     Args:
-        provider: LLM provider name ('gemini', 'claude', 'custom')
+        provider: LLM provider name ('gemini', 'claude', 'custom', or any
+            name added with @register)
         model_name: Optional specific model name
 
     Returns:
@@ -684,16 +1611,87 @@ def get_llm_client(provider: str = "gemini", model_name: Optional[str] = None) -
     Raises:
         ValueError: If provider is not supported
     """
+    return _shared_llm_client(provider.lower(), model_name)
+
+
+def reset_llm_client():
+    """Forget the shared clients (e.g. after changing API keys, or between tests)."""
+    _shared_llm_client.cache_clear()
+
+
+@functools.lru_cache(maxsize=16)
+def _shared_llm_client(provider: str, model_name: Optional[str]) -> LLMClient:
+    """Build the client for get_llm_client (provider already lower-cased)."""
+    try:
+        client_class = PROVIDERS[provider]
+    except KeyError:
+        raise ValueError(f"Unsupported LLM provider: {provider}") from None
+    return client_class(model_name)
+
+
+def get_batch_llm_client(provider: str = "claude", model_name: Optional[str] = None) -> BatchLLMClient:
+    """
+    Factory function for batch-API clients (bulk offline jobs).
+
+    Args:
+        provider: 'claude' or 'custom' (any OpenAI-compatible server with /v1/batches)
+        model_name: Optional specific model name
+
+    Returns:
+        BatchLLMClient instance
+
+    Raises:
+        ValueError: If the provider has no batch client
+    """
     provider = provider.lower()
 
-    if provider == "gemini":
-        return GeminiClient(model_name)
-    elif provider == "claude":
-        return ClaudeClient(model_name)
-    elif provider == "custom":
-        return CustomLLMClient(model_name)
+    if provider == "claude":
+        return ClaudeBatchClient(model_name)
+    elif provider in ("custom", "openai-batch"):
+        return CustomBatchClient(model_name)
+    else:
+        raise ValueError(f"No batch API client for LLM provider: {provider}")
+
+
+# Default models per provider (used when the env var for that provider is unset)
+_DEFAULT_MODELS = types.MappingProxyType({
+    "gemini": (
+        "gemini-2.0-flash-exp",
+        "gemini-1.5-pro",
+        "gemini-1.5-flash",
+    ),
+    "claude": (
+        "claude-3-5-sonnet-20241022",
+        "claude-3-5-haiku-20241022",
+        "claude-3-opus-20240229",
+    ),
+    "custom": (
+        "custom-model",
+    ),
+})
+
+
+def _split_models(value: str) -> Tuple[str, ...]:
+    """Parse a comma-separated model list, dropping blanks."""
+    return tuple(m.strip() for m in value.split(",") if m.strip())
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_models(gemini_env: str, claude_env: str, custom_env: str, custom_single: str) -> dict:
+    """Build the provider -> models mapping for one snapshot of the env vars."""
+    if custom_env:
+        custom_models = _split_models(custom_env)
+    elif custom_single:
+        # For custom, fall back to CUSTOM_LLM_MODEL if CUSTOM_MODELS not set
+        custom_models = (custom_single,)
     else:
-        raise ValueError(f"Unsupported LLM provider: {provider}")
+        custom_models = _DEFAULT_MODELS["custom"]
+
+    return {
+        "gemini": _split_models(gemini_env) if gemini_env else _DEFAULT_MODELS["gemini"],
+        "claude": _split_models(claude_env) if claude_env else _DEFAULT_MODELS["claude"],
+        "custom": custom_models,
+    }
 
 
 def get_available_models() -> dict:
@@ -705,56 +1703,26 @@ def get_available_models() -> dict:
     CLAUDE_MODELS=claude-3-5-sonnet-20241022,claude-3-5-haiku-20241022
     CUSTOM_MODELS=llama3:70b,mixtral:8x7b,gpt-4
 
+    The lists are parsed once per distinct set of values; changing the env
+    vars is picked up on the next call.
+
     Returns:
         Dictionary mapping provider names to list of available models
     """
-    # Default models
-    default_models = {
-        "gemini": [
-            "gemini-2.0-flash-exp",
-            "gemini-1.5-pro",
-            "gemini-1.5-flash"
-        ],
-        "claude": [
-            "claude-3-5-sonnet-20241022",
-            "claude-3-5-haiku-20241022",
-            "claude-3-opus-20240229"
-        ],
-        "custom": [
-            "custom-model"
-        ]
-    }
-
-    # Load from environment variables if available
-    available_models = {}
-
-    # Gemini models
-    gemini_models_env = os.getenv("GEMINI_MODELS", "")
-    if gemini_models_env:
-        available_models["gemini"] = [m.strip() for m in gemini_models_env.split(",") if m.strip()]
-    else:
-        available_models["gemini"] = default_models["gemini"]
-
-    # Claude models
-    claude_models_env = os.getenv("CLAUDE_MODELS", "")
-    if claude_models_env:
-        available_models["claude"] = [m.strip() for m in claude_models_env.split(",") if m.strip()]
-    else:
-        available_models["claude"] = default_models["claude"]
-
-    # Custom models
-    custom_models_env = os.getenv("CUSTOM_MODELS", "")
-    if custom_models_env:
-        available_models["custom"] = [m.strip() for m in custom_models_env.split(",") if m.strip()]
-    else:
-        # For custom, try to get from CUSTOM_LLM_MODEL if CUSTOM_MODELS not set
-        custom_model = os.getenv("CUSTOM_LLM_MODEL")
-        if custom_model:
-            available_models["custom"] = [custom_model]
-        else:
-            available_models["custom"] = default_models["custom"]
-
-    return available_models
+    environ = os.environ
+    parsed = _parse_models(
+        environ.get("GEMINI_MODELS", ""),
+        environ.get("CLAUDE_MODELS", ""),
+        environ.get("CUSTOM_MODELS", ""),
+        environ.get("CUSTOM_LLM_MODEL", ""),
+    )
+    # Fresh lists so callers can't alter the cached entry
+    return {provider: list(models) for provider, models in parsed.items()}
+
+
+def invalidate_models_cache():
+    """Drop the parsed model lists (for tests)."""
+    _parse_models.cache_clear()
 
 
 # Cache the available models (call get_available_models() to get fresh list)
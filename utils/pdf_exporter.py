@@ -1,17 +1,326 @@
 """PDF export utility using markdown-pdf."""
+import functools
+import hashlib
+import html
+import importlib.util
+import logging
+import math
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List, Set
 from io import BytesIO
+from itertools import repeat
 import tempfile
-from markdown_pdf import MarkdownPdf, Section
 import re
+import shutil
+import string
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _markdown_pdf():
+    """
+    Import markdown-pdf on first export.
+
+    It pulls in PyMuPDF and markdown-it, so importing this module (e.g. from
+    the workflow nodes) doesn't pay for them until a PDF is actually built.
+
+    Returns:
+        (MarkdownPdf, Section) classes
+    """
+    from markdown_pdf import MarkdownPdf, Section
+    return MarkdownPdf, Section
+
+
+@functools.lru_cache(maxsize=4)
+def _load_css(path: str, mtime: float) -> str:
+    """Read a stylesheet; keyed on mtime so an edited file is picked up again."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+# Body font size, line height and page margin declarations in resume_style.css,
+# and the placeholders _css_template swaps in for them
+_CSS_SETTINGS = (
+    ('  font-size:        9.5px;', '  font-size:        ${font_size}px;'),
+    ('  line-height:      1.2em;', '  line-height:      ${line_height}em;'),
+    ('  margin: 0.75in; /* Standard margins */', '  margin: ${page_margin}in; /* Standard margins */'),
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _css_template(css: str) -> string.Template:
+    """
+    Turn a stylesheet into a Template with font_size, line_height and page_margin slots.
+
+    Built once per stylesheet, so sizing a PDF is a single substitute() pass
+    instead of three replace() scans.
+    """
+    template = css.replace('$', '$$')
+    for default, placeholder in _CSS_SETTINGS:
+        if default not in template:
+            logger.warning("'%s' not found in CSS; that setting can't be customized", default.strip())
+        template = template.replace(default, placeholder)
+    return string.Template(template)
+
+
+# Cleared if MarkdownPdf.save() turns out not to accept a file object
+_save_to_buffer = True
+# Where the path-only fallback writes; None means the platform temp dir
+_TMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+
+def _build_pdf(markdown_content: str, css: str):
+    """Lay out markdown with the given stylesheet as a MarkdownPdf document."""
+    MarkdownPdf, Section = _markdown_pdf()
+    pdf = MarkdownPdf(toc_level=0)
+    pdf.add_section(Section(markdown_content, toc=False), user_css=css)
+    return pdf
+
+
+@functools.lru_cache(maxsize=1)
+def _buffer_save_errors() -> tuple:
+    """Exceptions MarkdownPdf.save() raises when it can't write into a file object."""
+    errors = (TypeError, AttributeError, ValueError)
+    try:
+        # PyMuPDF wraps errors from the file object (e.g. a missing method) in these
+        from pymupdf.mupdf import FzErrorBase
+    except ImportError:
+        return errors
+    return errors + (FzErrorBase,)
+
+
+def _save_pdf(markdown_content: str, css: str, out):
+    """
+    Render markdown with the given stylesheet into the binary file object out.
+
+    Saves straight into it (PyMuPDF's Document.save accepts BytesIO). If
+    that fails, the document is laid out again (a MarkdownPdf is spent
+    once save() has run) and saved through a temporary file. Only a
+    TypeError/AttributeError, i.e. a markdown-pdf version that insists on a
+    path, sends later calls straight to the temporary file.
+    """
+    global _save_to_buffer
+    pdf = _build_pdf(markdown_content, css)
+    if _save_to_buffer:
+        try:
+            pdf.save(out)
+            return
+        except _buffer_save_errors() as e:
+            logger.warning("In-memory PDF save failed (%s); using a temporary file", e)
+            if not isinstance(e, ValueError):
+                _save_to_buffer = False
+            out.seek(0)
+            out.truncate()
+        pdf = _build_pdf(markdown_content, css)
+
+    # Create temporary file for PDF generation (in RAM-backed /dev/shm where available)
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False, dir=_TMP_DIR) as tmp_file:
+        tmp_path = tmp_file.name
+    try:
+        pdf.save(tmp_path)
+        # Copy the PDF bytes across
+        with open(tmp_path, 'rb') as f:
+            shutil.copyfileobj(f, out)
+    finally:
+        # Clean up temporary file
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _render_pdf_bytes(markdown_content: str, css: str) -> bytes:
+    """Render markdown with the given stylesheet to PDF bytes (top level so worker processes can run it)."""
+    buffer = BytesIO()
+    _save_pdf(markdown_content, css, buffer)
+    return buffer.getvalue()
+
+
+# Rendered PDFs kept for repeat downloads, bounded by count and total size
+_PDF_CACHE_MAX_ENTRIES = 32
+_PDF_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# blake2b digest of (markdown, css) -> PDF bytes, least recently used first
+_pdf_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+_pdf_cache_bytes = 0
+_pdf_cache_lock = threading.Lock()
+
+
+def _cached_pdf_bytes(markdown_content: str, css: str) -> bytes:
+    """
+    Render markdown to PDF bytes, reusing the result for identical input.
+
+    The stylesheet already carries the font size, line height and margin,
+    so (markdown, css) identifies the output exactly.
+    """
+    global _pdf_cache_bytes
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(markdown_content.encode('utf-8'))
+    hasher.update(b'\0')
+    hasher.update(css.encode('utf-8'))
+    key = hasher.digest()
+
+    with _pdf_cache_lock:
+        pdf_bytes = _pdf_cache.get(key)
+        if pdf_bytes is not None:
+            _pdf_cache.move_to_end(key)
+            return pdf_bytes
+
+    pdf_bytes = _render_pdf_bytes(markdown_content, css)
+    if len(pdf_bytes) > _PDF_CACHE_MAX_BYTES:
+        return pdf_bytes
+
+    with _pdf_cache_lock:
+        if key not in _pdf_cache:
+            _pdf_cache[key] = pdf_bytes
+            _pdf_cache_bytes += len(pdf_bytes)
+            while len(_pdf_cache) > _PDF_CACHE_MAX_ENTRIES or _pdf_cache_bytes > _PDF_CACHE_MAX_BYTES:
+                _, evicted = _pdf_cache.popitem(last=False)
+                _pdf_cache_bytes -= len(evicted)
+    return pdf_bytes
+
+
+# A '## ' section header line, and the text of one non-blank line with the
+# surrounding whitespace left out
+_SECTION_RE = re.compile(r'^[^\S\n]*## [^\n]*\S', re.M)
+_LINE_TEXT_RE = re.compile(r'\S(?:[^\n]*\S)?')
+
+# Markdown the ReportLab backend understands
+_HEADING_RE = re.compile(r'(#{1,6})\s+(.*)')
+# Links, ***bold italics***, **bold** and *italics*, tried in that order at each
+# position so matches never overlap (and the tags they become nest properly)
+_INLINE_RE = re.compile(
+    r'\[([^\]]+)\]\(([^)]+)\)'
+    r'|\*\*\*(.+?)\*\*\*'
+    r'|\*\*(.+?)\*\*'
+    r'|\*(.+?)\*'
+)
+_PAGE_BREAK = '<div style="page-break-before: always;"></div>'
+# Browser default heading sizes, relative to body text
+_HEADING_SCALES = {1: 2.0, 2: 1.5, 3: 1.17, 4: 1.0, 5: 0.83, 6: 0.67}
+
+
+@functools.lru_cache(maxsize=1)
+def _reportlab_available() -> bool:
+    """Whether the optional ReportLab backend can be used (warns once if not)."""
+    if importlib.util.find_spec('reportlab') is not None:
+        return True
+    logger.warning("PDF_BACKEND=fast needs reportlab (pip install reportlab); using markdown-pdf")
+    return False
+
+
+@functools.lru_cache(maxsize=8)
+def _reportlab_styles(font_size: float, line_height: float) -> dict:
+    """Paragraph styles matching resume_style.css at the given body size."""
+    from reportlab.lib.styles import ParagraphStyle
+
+    size = font_size * 0.75  # CSS px -> pt
+    body = ParagraphStyle('body', fontName='Helvetica', fontSize=size, leading=size * line_height)
+    styles = {
+        'body': body,
+        'bullet': ParagraphStyle('bullet', parent=body, leftIndent=size * 1.5, bulletIndent=size * 0.5),
+    }
+    for level, scale in _HEADING_SCALES.items():
+        styles[level] = ParagraphStyle(
+            f'h{level}', parent=body, fontName='Helvetica-Bold',
+            fontSize=size * scale, leading=size * scale,  # headings use line-height: 1.0em
+            spaceBefore=size * 0.5, spaceAfter=size * 0.25, keepWithNext=1
+        )
+    return styles
+
+
+def _inline_markup(text: str) -> str:
+    """Convert markdown bold, italics and links to ReportLab paragraph markup."""
+    parts = []
+    position = 0
+    for match in _INLINE_RE.finditer(text):
+        parts.append(html.escape(text[position:match.start()], quote=False))
+        label, href, bold_italic, bold, italic = match.groups()
+        if href is not None:
+            parts.append(f'<link href="{html.escape(href)}">{_inline_markup(label)}</link>')
+        elif bold_italic is not None:
+            parts.append(f'<b><i>{_inline_markup(bold_italic)}</i></b>')
+        elif bold is not None:
+            parts.append(f'<b>{_inline_markup(bold)}</b>')
+        else:
+            parts.append(f'<i>{_inline_markup(italic)}</i>')
+        position = match.end()
+    parts.append(html.escape(text[position:], quote=False))
+    return ''.join(parts)
+
+
+def _render_reportlab_bytes(
+    markdown_content: str,
+    font_size: float,
+    line_height: float,
+    page_margin: float
+) -> bytes:
+    """
+    Render resume markdown straight to PDF with ReportLab (PDF_BACKEND=fast).
+
+    Covers what resumes use (headings, paragraphs, hard line breaks,
+    bullets, rules, bold/italics, links and explicit page breaks) without
+    an HTML layout pass, so it is much faster than markdown-pdf but
+    ignores the rest of the stylesheet.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import HRFlowable, PageBreak, Paragraph, SimpleDocTemplate, Spacer
+
+    styles = _reportlab_styles(font_size, line_height)
+    story = []
+    paragraph = []
+
+    def flush():
+        if paragraph:
+            story.append(Paragraph(''.join(paragraph).strip(), styles['body']))
+            paragraph.clear()
+
+    for line in markdown_content.split('\n'):
+        stripped = line.strip()
+        heading = _HEADING_RE.match(stripped)
+        if not stripped:
+            flush()
+        elif stripped == _PAGE_BREAK:
+            flush()
+            story.append(PageBreak())
+        elif heading:
+            flush()
+            story.append(Paragraph(_inline_markup(heading.group(2)), styles[len(heading.group(1))]))
+        elif len(stripped) >= 3 and stripped in ('*' * len(stripped), '-' * len(stripped), '_' * len(stripped)):
+            flush()
+            story.append(HRFlowable(width='100%', thickness=2, color=colors.black))
+        elif stripped.startswith(('- ', '* ', '+ ')):
+            flush()
+            story.append(Paragraph(_inline_markup(stripped[2:]), styles['bullet'], bulletText='\u2022'))
+        elif stripped.endswith('\\'):
+            # Trailing backslash is a hard line break
+            paragraph.append(_inline_markup(stripped[:-1]) + '<br/>')
+        else:
+            paragraph.append(_inline_markup(stripped) + ' ')
+    flush()
+
+    buffer = BytesIO()
+    margin = page_margin * inch
+    doc = SimpleDocTemplate(
+        buffer, pagesize=letter,
+        leftMargin=margin, rightMargin=margin, topMargin=margin, bottomMargin=margin
+    )
+    doc.build(story or [Spacer(1, 0)])
+    return buffer.getvalue()
 
 
 class PDFExporter:
     """Exports markdown resumes to PDF format using markdown-pdf."""
 
+    # Output directories already created by an earlier instance
+    _ensured_dirs: Set[Path] = set()
+
     def __init__(self, output_dir: str = "data/resumes"):
         """
         Initialize PDF exporter.
@@ -20,12 +329,14 @@ class PDFExporter:
             output_dir: Directory to save PDFs
         """
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self.output_dir not in PDFExporter._ensured_dirs:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            PDFExporter._ensured_dirs.add(self.output_dir)
 
-        # Load custom CSS from file
+        # Load custom CSS from file (cached, so only re-read when it changes)
         css_path = Path(__file__).parent / "resume_style.css"
-        with open(css_path, 'r', encoding='utf-8') as f:
-            self.custom_css = f.read()
+        self.custom_css = _load_css(str(css_path), css_path.stat().st_mtime)
+        self._css_template = _css_template(self.custom_css)
 
         # Page layout constants (based on letter size with 0.75in margins)
         # Calibrated from actual PDF output: page breaks at line 51 of markdown
@@ -49,17 +360,14 @@ class PDFExporter:
         total_lines = 0
 
         for line in lines:
-            if not line.strip():
+            if not line or line.isspace():
                 # Empty line counts as 1
                 total_lines += 1
             elif line.startswith('#'):
                 # Headings: count as 2 lines (heading + space)
                 total_lines += 2
-            elif line.startswith('***'):
-                # Separator: counts as 1 line
-                total_lines += 1
-            elif line.startswith('*') or line.startswith('-'):
-                # Bullet point: count as 1 line
+            elif line.startswith(('*', '-')):
+                # Separator (***) or bullet point: count as 1 line
                 total_lines += 1
             else:
                 # Regular text: estimate based on character count
@@ -79,86 +387,88 @@ class PDFExporter:
         Returns:
             Markdown with page breaks inserted
         """
-        lines = markdown_content.split('\n')
-        result = []
-        current_page_lines = 0
-        i = 0
-
-        while i < len(lines):
-            line = lines[i]
-
-            # Check if this is a section header (## heading)
-            if line.strip().startswith('## '):
-                # Look ahead to count actual lines in this section
-                section_lines = 2  # Heading + spacing
-                j = i + 1
-
-                # Count lines until next section or end, accounting for text wrapping
-                while j < len(lines) and not lines[j].strip().startswith('## '):
-                    line_text = lines[j].strip()
-                    if line_text:
-                        # Account for text wrapping on long lines
-                        line_length = len(line_text)
-                        if line_length > self.chars_per_line:
-                            # Long line will wrap
-                            wrapped_lines = (line_length // self.chars_per_line) + 1
-                            section_lines += wrapped_lines
-                        else:
-                            section_lines += 1
-                    j += 1
-
-                # Decide if we need a page break
-                # Only break if we're not at the very top of a page
-                # Break conditions:
-                # 1. Section fits on one page BUT would overflow current page
-                # 2. Section is very large (>35 lines) and we're past the first few lines
-                #
-                # Don't break if section is small and will flow naturally
-
-                section_fits_on_page = section_lines <= self.lines_per_page
-                section_is_very_large = section_lines > 35  # Won't fit on one page
-                would_overflow = (current_page_lines + section_lines) > self.lines_per_page
-                past_minimum = current_page_lines > 5  # Not at very top
-
-                # Small sections (that fit on one page) should stay together - break before them
-                # Large sections will naturally span pages - let them flow
-                needs_break = current_page_lines > 0 and (
-                    (section_fits_on_page and would_overflow) or  # Small section needs break to stay together
-                    (section_is_very_large and past_minimum)  # Very large section, give fresh page
-                )
-
-                if needs_break:
-                    # Insert page break before section
-                    result.append('<div style="page-break-before: always;"></div>')
-                    result.append('')
-                    current_page_lines = 0
-
-                # Add the section header and count lines as we go
-                result.append(line)
-                current_page_lines += 2  # Heading takes ~2 lines with spacing
-                i += 1
-
-                # Now process the section content and track lines accurately
-                while i < len(lines) and not lines[i].strip().startswith('## '):
-                    line_text = lines[i].strip()
-                    result.append(lines[i])
-                    if line_text:
-                        # Account for wrapping
-                        if len(line_text) > self.chars_per_line:
-                            wrapped = (len(line_text) // self.chars_per_line) + 1
-                            current_page_lines += wrapped
-                        else:
-                            current_page_lines += 1
-                    i += 1
+        # Offsets of each section header; sections run up to the next one
+        starts = [match.start() for match in _SECTION_RE.finditer(markdown_content)]
+        if not starts:
+            return markdown_content
+        ends = starts[1:] + [len(markdown_content)]
+
+        preamble_lines = sum(1 for _ in _LINE_TEXT_RE.finditer(markdown_content, 0, starts[0]))
+        section_sizes = []
+        for start, end in zip(starts, ends):
+            section_lines = 2  # Heading + spacing
+            body = markdown_content.find('\n', start, end)
+            if body != -1:
+                for match in _LINE_TEXT_RE.finditer(markdown_content, body, end):
+                    # Account for text wrapping on long lines
+                    line_length = match.end() - match.start()
+                    if line_length > self.chars_per_line:
+                        section_lines += (line_length // self.chars_per_line) + 1
+                    else:
+                        section_lines += 1
+            section_sizes.append(section_lines)
+
+        breaks = self._page_break_points(section_sizes, preamble_lines)
+
+        result = [markdown_content[:starts[0]]]
+        for index, (start, end) in enumerate(zip(starts, ends)):
+            if index in breaks:
+                # Insert page break before section
+                result.append('<div style="page-break-before: always;"></div>\n\n')
+            result.append(markdown_content[start:end])
+
+        return ''.join(result)
+
+    def _page_break_points(self, section_sizes: List[int], preamble_lines: int) -> set:
+        """
+        Choose which sections start a new page.
 
-            else:
-                # Regular line (shouldn't reach here in section-based processing)
-                result.append(line)
-                if line.strip():
-                    current_page_lines += 1
-                i += 1
+        Minimizes the total squared empty space left at the bottom of each
+        page but the last, over all ways of grouping consecutive
+        sections into pages, like Knuth-Plass line breaking does for words.
+        Sections that fit on a page are never split; one that doesn't just
+        flows on from the content before it.
 
-        return '\n'.join(result)
+        Args:
+            section_sizes: Estimated rendered lines of each section
+            preamble_lines: Lines before the first section (on the first page)
+
+        Returns:
+            Indexes of the sections to put a page break before
+        """
+        # The preamble is laid out like a section that can't be broken before
+        sizes = ([preamble_lines] if preamble_lines else []) + section_sizes
+        offset = len(sizes) - len(section_sizes)
+        count = len(sizes)
+        page = self.lines_per_page
+
+        # best[j]: least cost of laying out sizes[:j] with a page break before j
+        best = [0.0] + [math.inf] * count
+        start = [0] * (count + 1)
+        for i in range(count):
+            # Lay sizes[i:j] out from the top of a page, extending j one section at a time
+            fill = 0
+            for j in range(i + 1, count + 1):
+                size = sizes[j - 1]
+                if size > page:
+                    # Oversized section: it flows on from whatever precedes it
+                    fill = (fill + size) % page
+                elif fill + size <= page:
+                    fill += size
+                else:
+                    break  # would split a section that fits on a page
+                cost = best[i] + (0 if j == count or not fill else (page - fill) ** 2)
+                if cost < best[j]:
+                    best[j] = cost
+                    start[j] = i
+
+        breaks = set()
+        j = count
+        while j > 0:
+            j = start[j]
+            if j > 0:
+                breaks.add(j - offset)
+        return breaks
 
     def markdown_to_pdf(
         self,
@@ -187,14 +497,10 @@ class PDFExporter:
         # Use markdown as-is without automatic page break insertion
         # Page breaks should be manually added in the markdown with: <div style="page-break-before: always;"></div>
 
-        # Create PDF with custom CSS
-        pdf = MarkdownPdf(toc_level=0)
-
-        # Add custom CSS styling
-        pdf.add_section(Section(markdown_content, toc=False), user_css=self.custom_css)
-
-        # Save to file
-        pdf.save(str(output_path))
+        # Create PDF with custom CSS styling; shares markdown_to_pdf_bytes' cache,
+        # so saving a resume just rendered for download at default settings
+        # doesn't lay it out again
+        output_path.write_bytes(_cached_pdf_bytes(markdown_content, self.custom_css))
 
         return str(output_path)
 
@@ -203,73 +509,116 @@ class PDFExporter:
         markdown_content: str,
         font_size: float = 9.5,
         line_height: float = 1.2,
-        page_margin: float = 0.75
+        page_margin: float = 0.75,
+        backend: Optional[str] = None
     ) -> bytes:
         """
         Convert markdown to PDF bytes for download.
 
+        Repeat requests for the same content and settings (e.g. clicking
+        Download again) are served from an in-memory cache.
+
         Args:
             markdown_content: Markdown text
             font_size: Font size in pixels (default: 9.5)
             line_height: Line height as em multiplier (default: 1.2)
             page_margin: Page margin in inches (default: 0.75)
+            backend: 'fidelity' (markdown-pdf, full stylesheet) or 'fast'
+                (ReportLab, if installed); defaults to PDF_BACKEND or 'fidelity'
 
         Returns:
             PDF file as bytes
         """
-        # Create temporary file for PDF generation
+        if (backend or os.getenv('PDF_BACKEND', 'fidelity')) == 'fast' and _reportlab_available():
+            return _render_reportlab_bytes(markdown_content, font_size, line_height, page_margin)
+
+        custom_css = self._sized_css(font_size, line_height, page_margin)
+        return _cached_pdf_bytes(markdown_content, custom_css)
+
+    def iter_pdf_chunks(
+        self,
+        markdown_content: str,
+        font_size: float = 9.5,
+        line_height: float = 1.2,
+        page_margin: float = 0.75,
+        chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """
+        Convert markdown to PDF and yield it in chunks, for streaming responses.
+
+        The PDF is saved to a temporary file and read back chunk by chunk,
+        so unusually large documents aren't held as one bytes object.
+        (PyMuPDF can't save into a SpooledTemporaryFile.)
+
+        Args:
+            markdown_content: Markdown text
+            font_size: Font size in pixels (default: 9.5)
+            line_height: Line height as em multiplier (default: 1.2)
+            page_margin: Page margin in inches (default: 0.75)
+            chunk_size: Bytes per yielded chunk (default: 64KB)
+
+        Yields:
+            Consecutive pieces of the PDF file
+        """
+        custom_css = self._sized_css(font_size, line_height, page_margin)
         with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
             tmp_path = tmp_file.name
-
         try:
-            # Debug: Check if we're using non-default values
-            import os
-            debug_mode = os.getenv('DEBUG_MODE', '0') == '1'
-
-            # ALWAYS print when non-default values are used
-            print(f"[PDF Export] markdown_to_pdf_bytes called with: font_size={font_size}px, line_height={line_height}em, page_margin={page_margin}in")
-
-            if debug_mode or (font_size != 9.5 or line_height != 1.2 or page_margin != 0.75):
-                print(f"[PDF Export] Non-default values detected!")
-
-            # Customize CSS with user-specified font size, line height, and margin
-            # Note: CSS has leading spaces before properties in body selector
-            custom_css = self.custom_css.replace(
-                '  font-size:        9.5px;',
-                f'  font-size:        {font_size}px;'
-            ).replace(
-                '  line-height:      1.2em;',
-                f'  line-height:      {line_height}em;'
-            ).replace(
-                '  margin: 0.75in; /* Standard margins */',
-                f'  margin: {page_margin}in; /* Standard margins */'
-            )
-
-            # Verify replacements happened - ALWAYS show this
-            font_size_replaced = f'  font-size:        {font_size}px;' in custom_css
-            line_height_replaced = f'  line-height:      {line_height}em;' in custom_css
-            margin_replaced = f'  margin: {page_margin}in; /* Standard margins */' in custom_css
-
-            print(f"[PDF Export] Replacements: font_size={font_size_replaced}, line_height={line_height_replaced}, margin={margin_replaced}")
-
-            if not (font_size_replaced and line_height_replaced and margin_replaced):
-                print(f"[PDF Export] WARNING: Some replacements failed!")
-                print(f"[PDF Export] Searching for font-size in CSS...")
-                if '9.5px' in custom_css:
-                    print(f"[PDF Export] ERROR: Still contains default 9.5px!")
-
-            # Create PDF with custom CSS
-            pdf = MarkdownPdf(toc_level=0)
-            pdf.add_section(Section(markdown_content, toc=False), user_css=custom_css)
-            pdf.save(tmp_path)
-
-            # Read the PDF bytes
+            _build_pdf(markdown_content, custom_css).save(tmp_path)
             with open(tmp_path, 'rb') as f:
-                pdf_bytes = f.read()
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            os.unlink(tmp_path)
 
-            return pdf_bytes
+    def _sized_css(self, font_size: float, line_height: float, page_margin: float) -> str:
+        """Return the stylesheet with the user's font size, line height and margin."""
+        logger.debug(
+            "PDF requested with: font_size=%spx, line_height=%sem, page_margin=%sin",
+            font_size, line_height, page_margin
+        )
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        # Customize CSS with user-specified font size, line height, and margin
+        custom_css = self._css_template.substitute(
+            font_size=font_size,
+            line_height=line_height,
+            page_margin=page_margin
+        )
+
+        return custom_css
+
+    def export_batch(
+        self,
+        contents: List[str],
+        max_workers: Optional[int] = None,
+        font_size: float = 9.5,
+        line_height: float = 1.2,
+        page_margin: float = 0.75
+    ) -> List[bytes]:
+        """
+        Convert several markdown documents to PDF bytes in parallel.
+
+        Rendering is CPU-bound, so each document goes to a separate process
+        (bypassing the GIL); a single document is rendered in-process. Only
+        the markdown and the sized stylesheet are sent to the workers.
+
+        Args:
+            contents: Markdown texts
+            max_workers: Worker processes (default: one per CPU)
+            font_size: Font size in pixels (default: 9.5)
+            line_height: Line height as em multiplier (default: 1.2)
+            page_margin: Page margin in inches (default: 0.75)
+
+        Returns:
+            PDF bytes for each document, in the same order as contents
+        """
+        custom_css = self._sized_css(font_size, line_height, page_margin)
+        if len(contents) <= 1:
+            return [_cached_pdf_bytes(content, custom_css) for content in contents]
+
+        workers = min(max_workers or os.cpu_count() or 1, len(contents))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_render_pdf_bytes, contents, repeat(custom_css)))
@@ -1,4 +1,13 @@
 """Centralized resume standards and guidelines for all agents."""
+import re
+
+# Job metadata: **Job Title** | Company | Location | *Employment Type*
+# (kept within one line, wherever on it it starts)
+_METADATA_RE = re.compile(r'\*\*[^*\n]+\*\*[^\S\n]*\|.*\|.*\|.*\*[^*\n]+\*')
+# Skips blank lines and captures the next non-empty one
+_NEXT_LINE_RE = re.compile(r'\s*(.*)')
+# One whitespace-delimited word
+_WORD_RE = re.compile(r'\S+')
 
 # Resume structure and formatting standards
 RESUME_STANDARDS = """
@@ -179,14 +188,19 @@ VALIDATION_CRITERIA = {
 }
 
 
+# Prompt prefixes, joined once at import
+_MODIFICATION_PREFIX = f"{RESUME_STANDARDS}\n\n{MODIFICATION_GUIDELINES}"
+_OPTIMIZATION_PREFIX = f"{RESUME_STANDARDS}\n\n{OPTIMIZATION_GUIDELINES}"
+
+
 def get_modification_prompt_prefix() -> str:
     """Get the standards section to prepend to modification agent prompts."""
-    return f"{RESUME_STANDARDS}\n\n{MODIFICATION_GUIDELINES}"
+    return _MODIFICATION_PREFIX
 
 
 def get_optimization_prompt_prefix() -> str:
     """Get the standards section to prepend to optimizer agent prompts."""
-    return f"{RESUME_STANDARDS}\n\n{OPTIMIZATION_GUIDELINES}"
+    return _OPTIMIZATION_PREFIX
 
 
 def validate_resume_against_standards(resume: str) -> dict:
@@ -201,37 +215,38 @@ def validate_resume_against_standards(resume: str) -> dict:
     """
     issues = []
 
-    # Check for backslashes in metadata lines
-    import re
-    metadata_pattern = re.compile(r'\*\*[^*]+\*\*\s*\|.*\|.*\|.*\*[^*]+\*')
-    for match in metadata_pattern.finditer(resume):
-        line = match.group()
-        if not line.rstrip().endswith('\\'):
+    # Check metadata for its trailing backslash, and the headline after each
+    # metadata line
+    for match in _METADATA_RE.finditer(resume):
+        # The match stops at the closing '*'; the backslash comes after it
+        line_end = resume.find('\n', match.end())
+        if line_end == -1:
+            line_end = len(resume)
+        metadata = resume[match.start():line_end]
+        if not metadata.rstrip().endswith('\\'):
             issues.append({
                 "severity": "CRITICAL",
                 "category": "Experience Formatting",
-                "description": f"Job metadata missing backslash: {line[:50]}..."
+                "description": f"Job metadata missing backslash: {metadata[:50]}..."
             })
 
-    # Check for job headlines
-    lines = resume.split('\n')
-    for i, line in enumerate(lines):
-        if metadata_pattern.match(line):
-            # Check if next non-empty line is italicized
-            j = i + 1
-            while j < len(lines) and not lines[j].strip():
-                j += 1
-            if j < len(lines):
-                next_line = lines[j].strip()
-                if not (next_line.startswith('*') and next_line.endswith('*') and not next_line.startswith('**')):
-                    issues.append({
-                        "severity": "WARNING",
-                        "category": "Experience Formatting",
-                        "description": f"Missing or improperly formatted headline after: {line[:50]}..."
-                    })
+        # Only metadata that starts its line (after indentation) is a job entry
+        line_start = resume.rfind('\n', 0, match.start()) + 1
+        if resume[line_start:match.start()].strip():
+            continue
+        line = resume[line_start:line_end]
+
+        # Check if next non-empty line is italicized
+        next_line = _NEXT_LINE_RE.match(resume, line_end).group(1).strip()
+        if next_line and not (next_line.startswith('*') and next_line.endswith('*') and not next_line.startswith('**')):
+            issues.append({
+                "severity": "WARNING",
+                "category": "Experience Formatting",
+                "description": f"Missing or improperly formatted headline after: {line[:50]}..."
+            })
 
     # Word count check
-    word_count = len(resume.split())
+    word_count = sum(1 for _ in _WORD_RE.finditer(resume))
     if word_count > 800:
         issues.append({
             "severity": "WARNING",
@@ -15,9 +15,9 @@ import json
 import os
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+from utils.env_cache import load_env_once
 
-load_dotenv()
+load_env_once()
 
 # Local file fallback
 SETTINGS_FILE = Path(__file__).parent.parent / ".settings.json"